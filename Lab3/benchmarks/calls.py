@@ -0,0 +1,75 @@
+import argparse
+import os
+import tempfile
+
+from benchmarks.loops import MeasureRun
+from tools.translator import *
+
+
+class GlobalsTranslator(Translator):
+    """
+        Translator as it was before the direct calls: every function is looked up in globals() on the call.
+    """
+
+    def ParseFunctionCall(self, call_node):
+        call = super().ParseFunctionCall(call_node)
+        call.func = ast.Subscript(value=ast.Call(func=ast.Name(id='globals', ctx=ast.Load()), args=[], keywords=[]),
+                                  slice=ast.Constant(value=call.func.id), ctx=ast.Load())
+        return call
+
+
+def GenerateRecursiveProgram(size):
+    """
+        Generates CPP program with the recursive fibonacci function called on the given number.
+    """
+
+    return "\n".join([
+        "#include <iostream>",
+        "using namespace std;",
+        "int fib(int n)",
+        "{",
+        "    int a, b, r;",
+        "    r = n;",
+        "    if (n > 1)",
+        "    {",
+        "        a = fib(n - 1);",
+        "        b = fib(n - 2);",
+        "        r = a + b;",
+        "    }",
+        "    return r;",
+        "}",
+        "int main()",
+        "{",
+        "    int res;",
+        f"    res = fib({size});",
+        "    cout << res << endl;",
+        "    return 0;",
+        "}",
+        ""
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares direct calls and calls through globals().")
+    parser.add_argument("--size", type=int, default=25, help="number of the fibonacci number computed recursively")
+    parser.add_argument("--repeat", type=int, default=3, help="runs of the program, the fastest one is taken")
+    args = parser.parse_args()
+
+    with tempfile.NamedTemporaryFile("w", suffix=".cpp", delete=False) as file:
+        file.write(GenerateRecursiveProgram(args.size))
+
+    try:
+        globals_time = MeasureRun(GlobalsTranslator, file.name, args.repeat)
+        direct_time = MeasureRun(Translator, file.name, args.repeat)
+    finally:
+        os.remove(file.name)
+
+    print("{:<8} {:<10}".format('CALL', 'TIME'))
+    print("{:<8} {:<10}".format('-' * 8, '-' * 10))
+    print("{:<8} {:<10.4f}".format('globals', globals_time))
+    print("{:<8} {:<10.4f}".format('direct', direct_time))
+    print(f"\nDirect calls run {globals_time / direct_time:.2f}x as fast.")
+
+
+if __name__ == '__main__':
+    main()
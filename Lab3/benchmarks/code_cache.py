@@ -0,0 +1,52 @@
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import time
+
+from benchmarks.pipeline import GenerateProgram
+from main import runProgram
+
+
+def MeasureRun(file_name, cache_dir):
+    """
+        Runs the program in the run mode with the given cache directory and returns the time of the run.
+    """
+
+    options = argparse.Namespace(vectorize=False, memoize=False, peephole=True, cache_dir=cache_dir)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        runProgram(file_name, options)
+
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares the run of the program translated again and cached.")
+    parser.add_argument("--size", type=int, default=64, help="amount of the functions in the generated program")
+    parser.add_argument("--runs", type=int, default=5, help="runs of the program with the warm cache")
+    args = parser.parse_args()
+
+    cache_dir = tempfile.mkdtemp()
+    with tempfile.NamedTemporaryFile("w", suffix=".cpp", delete=False) as file:
+        file.write(GenerateProgram(args.size))
+
+    try:
+        cold = MeasureRun(file.name, cache_dir)
+        warm = min(MeasureRun(file.name, cache_dir) for _ in range(args.runs))
+    finally:
+        os.remove(file.name)
+        shutil.rmtree(cache_dir)
+
+    print("{:<8} {:<10}".format('CACHE', 'TIME'))
+    print("{:<8} {:<10}".format('-' * 8, '-' * 10))
+    print("{:<8} {:<10.4f}".format('cold', cold))
+    print("{:<8} {:<10.4f}".format('warm', warm))
+    print(f"\nCached runs are {cold / warm:.0f}x as fast.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,21 @@
+#include <iostream>
+using namespace std;
+int main()
+{
+    int x, k, c;
+    cin >> c;
+    k = 0;
+    x = 7;
+    while (k < 3)
+    {
+        x = 0;
+        if (c > 0)
+        {
+            break;
+        }
+        x = 5;
+        k++;
+    }
+    cout << x << " " << k << endl;
+    return 0;
+}
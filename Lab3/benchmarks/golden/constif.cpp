@@ -0,0 +1,26 @@
+#include <iostream>
+using namespace std;
+int main()
+{
+    int a, b;
+    cin >> a;
+    b = 1;
+    if (true)
+    {
+        b = b + 10;
+    }
+    else
+    {
+        b = b + 20;
+    }
+    if (false)
+    {
+        b = 0;
+    }
+    if (a > 3)
+    {
+        b = b * 2;
+    }
+    cout << b << endl;
+    return 0;
+}
@@ -0,0 +1,36 @@
+#include <iostream>
+using namespace std;
+int main()
+{
+    int s, k, n;
+    cin >> n;
+    s = 0;
+    k = 0;
+    for (int i = 0; i < n; i = i + 1)
+    {
+        if (i % 3 == 0)
+        {
+            continue;
+        }
+        s = s + i;
+    }
+    for (int j = 1; j < n; j = j * 2)
+    {
+        if (j == 4)
+        {
+            continue;
+        }
+        s = s + j * 10;
+    }
+    while (k < n)
+    {
+        k++;
+        if (k % 2 == 0)
+        {
+            continue;
+        }
+        s = s + 100;
+    }
+    cout << s << " " << k << endl;
+    return 0;
+}
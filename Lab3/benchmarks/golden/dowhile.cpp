@@ -0,0 +1,24 @@
+#include <iostream>
+using namespace std;
+int main()
+{
+    int x, s, n;
+    cin >> n;
+    x = 0;
+    s = 0;
+    do
+    {
+        x = x + 1;
+        if (x == 2)
+        {
+            continue;
+        }
+        if (x > 6)
+        {
+            break;
+        }
+        s = s + x;
+    } while (x < n);
+    cout << x << " " << s << endl;
+    return 0;
+}
@@ -0,0 +1,25 @@
+#include <iostream>
+using namespace std;
+
+int main()
+{
+    int n, x, y, s;
+    cin >> n;
+    s = n;
+    while (1)
+    {
+        x = s * 2;
+        break;
+    }
+    do
+    {
+        y = x + 1;
+        s = s + y;
+        if (s > 40)
+        {
+            break;
+        }
+    } while (true);
+    cout << x << " " << y << " " << s << endl;
+    return 0;
+}
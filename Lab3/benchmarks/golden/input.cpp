@@ -0,0 +1,20 @@
+#include <iostream>
+using namespace std;
+
+int main()
+{
+    int a, b, c;
+    double d;
+    cin >> a >> b;
+    c = a;
+    if (b > 0)
+    {
+        cin >> d;
+    }
+    else
+    {
+        d = 0.5;
+    }
+    cout << c << " " << b << " " << d << endl;
+    return 0;
+}
@@ -0,0 +1,17 @@
+#include <iostream>
+using namespace std;
+int main()
+{
+    int a[5];
+    int i, p, q;
+    cin >> i;
+    a[i] = 3;
+    a[i] = a[i] * 4;
+    a[i + 1] = a[i] + 2;
+    a[i + 1] = a[i + 1] - 1;
+    a[i] = a[i] + a[i + 1];
+    p = a[i];
+    q = a[i + 1];
+    cout << p << " " << q << endl;
+    return 0;
+}
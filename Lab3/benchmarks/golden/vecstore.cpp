@@ -0,0 +1,36 @@
+#include <iostream>
+using namespace std;
+
+int main()
+{
+    int a[4];
+    int b[4];
+    int c[4];
+    int n, k;
+    cin >> n;
+    for (int i = 0; i < n; i++)
+    {
+        a[i] = i * 2 - 1;
+    }
+    a[1] = 5 / 2;
+    a[2] = a[3] / 2;
+    for (int j = 0; j < n; j++)
+    {
+        b[j] = j + 1;
+    }
+    b[0] = b[3] * 2;
+    for (int p = 0; p < n; p++)
+    {
+        c[p] = p * 3 + n;
+    }
+    c[0] = c[1] * 2 - c[3];
+    k = 1;
+    for (int m = 1; m < n; m++)
+    {
+        b[m] = b[m] + a[m] * k;
+    }
+    cout << a[0] << " " << a[1] << " " << a[2] << " " << a[3] << endl;
+    cout << b[0] << " " << b[1] << " " << b[2] << " " << b[3] << endl;
+    cout << c[0] << " " << c[1] << " " << c[2] << " " << c[3] << endl;
+    return 0;
+}
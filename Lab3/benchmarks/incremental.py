@@ -0,0 +1,81 @@
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.pipeline import GenerateProgram
+from tools.analyzer import *
+from tools.tree_parser import *
+from tools.semantic_parser import *
+
+
+def ParseProgram(file_name):
+    """
+        Runs the lexer and the parser on the given file and returns the tree with the tables.
+    """
+
+    literal_table = LiteralTable()
+    variable_table = []
+
+    lexemes = LexicalAnalyzer(file_name, literal_table, variable_table).GetLexemes()
+    root = TreeParser(file_name, lexemes, literal_table, variable_table).GetTree()
+
+    variable_table = [var for var in variable_table if var.itemType != Language.VariableTypes.UNKNOWN]
+
+    return root, literal_table, VariableTableView(variable_table)
+
+
+def MeasureSemantic(file_name, cache=None):
+    """
+        Parses the file and returns the time of its semantic analysis with the provided cache.
+    """
+
+    root, literal_table, variable_view = ParseProgram(file_name)
+
+    start = time.perf_counter()
+    SemanticParser(file_name, root, literal_table, variable_view, cache)
+
+    return time.perf_counter() - start
+
+
+def EditProgram(source, function_index):
+    """
+        Changes one statement in the body of the given function of the generated program.
+    """
+
+    line = f"    int v{function_index}_0 = a + b * 2;"
+    return source.replace(line, f"    int v{function_index}_0 = a + b * 3;")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares full and incremental semantic analysis after an edit.")
+    parser.add_argument("--size", type=int, default=128, help="amount of the functions in the generated program")
+    args = parser.parse_args()
+
+    source = GenerateProgram(args.size)
+    edited = EditProgram(source, args.size // 2)
+
+    with tempfile.NamedTemporaryFile("w", suffix=".cpp", delete=False) as original_file:
+        original_file.write(source)
+    with tempfile.NamedTemporaryFile("w", suffix=".cpp", delete=False) as edited_file:
+        edited_file.write(edited)
+
+    try:
+        # Warm the cache on the original program, then recheck the edited one
+        cache = SemanticCache()
+        MeasureSemantic(original_file.name, cache)
+        incremental = MeasureSemantic(edited_file.name, cache)
+        full = MeasureSemantic(edited_file.name)
+    finally:
+        os.remove(original_file.name)
+        os.remove(edited_file.name)
+
+    print("{:<12} {:<10} {:<10}".format('MODE', 'TIME', 'ANALYZED'))
+    print("{:<12} {:<10} {:<10}".format('-' * 12, '-' * 10, '-' * 10))
+    print("{:<12} {:<10.4f} {:<10}".format('full', full, cache.Hits + cache.Misses))
+    print("{:<12} {:<10.4f} {:<10}".format('incremental', incremental, cache.Misses))
+    print(f"\nRechecked {cache.Misses} of {cache.Hits + cache.Misses} functions, {full / incremental:.1f}x faster.")
+
+
+if __name__ == '__main__':
+    main()
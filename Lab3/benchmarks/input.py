@@ -0,0 +1,99 @@
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.incremental import ParseProgram
+from tools.translator import *
+
+
+class LineTranslator(Translator):
+    """
+        Translator as it was before the token stream: every variable of cin reads its own line with input().
+    """
+
+    def GetInputValue(self, item_type):
+        line = ast.Call(func=ast.Name(id="input", ctx=ast.Load()), args=[], keywords=[])
+        return ast.Call(func=ast.Name(id=self.GetArgType(item_type), ctx=ast.Load()), args=[line], keywords=[])
+
+
+def GenerateInputProgram():
+    """
+        Generates CPP program summing the numbers of the input.
+    """
+
+    return "\n".join([
+        "#include <iostream>",
+        "using namespace std;",
+        "int main()",
+        "{",
+        "    int n, s, x;",
+        "    cin >> n;",
+        "    s = 0;",
+        "    for (int i = 0; i < n; i++)",
+        "    {",
+        "        cin >> x;",
+        "        s = s + x;",
+        "    }",
+        "    cout << s << endl;",
+        "    return 0;",
+        "}",
+        ""
+    ])
+
+
+def MeasureInput(translator_class, file_name, input_name):
+    """
+        Translates the program and returns the time of its run on the given input file.
+    """
+
+    root, literal_table, variable_view = ParseProgram(file_name)
+    stdin = sys.stdin
+
+    try:
+        # The translator runs the program once, on the empty input
+        with contextlib.redirect_stdout(io.StringIO()):
+            sys.stdin = io.StringIO("0\n")
+            code = translator_class(root, literal_table, variable_view, print_code=False).GetCode()
+
+            with open(input_name) as sys.stdin:
+                start = time.perf_counter()
+                RunTranslatedCode(code)
+                return time.perf_counter() - start
+    finally:
+        sys.stdin = stdin
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares cin translated to input() and to the token stream.")
+    parser.add_argument("--size", type=int, default=1000000, help="amount of the numbers in the input")
+    args = parser.parse_args()
+
+    with tempfile.NamedTemporaryFile("w", suffix=".cpp", delete=False) as file:
+        file.write(GenerateInputProgram())
+
+    # One number per line, so that input() can read it too
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as input_file:
+        input_file.write(f"{args.size}\n")
+        input_file.write("\n".join(str(i % 1000) for i in range(args.size)))
+        input_file.write("\n")
+
+    try:
+        line_time = MeasureInput(LineTranslator, file.name, input_file.name)
+        token_time = MeasureInput(Translator, file.name, input_file.name)
+    finally:
+        os.remove(file.name)
+        os.remove(input_file.name)
+
+    print("{:<8} {:<10}".format('INPUT', 'TIME'))
+    print("{:<8} {:<10}".format('-' * 8, '-' * 10))
+    print("{:<8} {:<10.4f}".format('input()', line_time))
+    print("{:<8} {:<10.4f}".format('tokens', token_time))
+    print(f"\nToken stream runs {line_time / token_time:.2f}x as fast.")
+
+
+if __name__ == '__main__':
+    main()
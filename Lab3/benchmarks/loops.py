@@ -0,0 +1,90 @@
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+from benchmarks.incremental import ParseProgram
+from tools.translator import *
+
+
+class WhileTranslator(Translator):
+    """
+        Translator as it was before the counted cycles: every for cycle becomes while.
+    """
+
+    def ParseRangeForStatement(self, for_node):
+        return None
+
+
+def GenerateLoopProgram(size):
+    """
+        Generates CPP program with the nested counted cycles of the given size.
+    """
+
+    return "\n".join([
+        "#include <iostream>",
+        "using namespace std;",
+        "int main()",
+        "{",
+        "    int s;",
+        "    s = 0;",
+        f"    for (int i = 0; i < {size}; i++)",
+        "    {",
+        f"        for (int j = {size}; j > 0; j = j - 2)",
+        "        {",
+        "            s = s + i * j % 7;",
+        "        }",
+        "    }",
+        "    cout << s << endl;",
+        "    return 0;",
+        "}",
+        ""
+    ])
+
+
+def MeasureRun(translator_class, file_name, repeat):
+    """
+        Translates the program and returns the best time of its run.
+    """
+
+    root, literal_table, variable_view = ParseProgram(file_name)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        code = translator_class(root, literal_table, variable_view, print_code=False).GetCode()
+
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            RunTranslatedCode(code)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares counted cycles translated to range and to while.")
+    parser.add_argument("--size", type=int, default=600, help="amount of the iterations of the outer cycle")
+    parser.add_argument("--repeat", type=int, default=3, help="runs of the program, the fastest one is taken")
+    args = parser.parse_args()
+
+    with tempfile.NamedTemporaryFile("w", suffix=".cpp", delete=False) as file:
+        file.write(GenerateLoopProgram(args.size))
+
+    try:
+        while_time = MeasureRun(WhileTranslator, file.name, args.repeat)
+        range_time = MeasureRun(Translator, file.name, args.repeat)
+    finally:
+        os.remove(file.name)
+
+    print("{:<8} {:<10}".format('CYCLE', 'TIME'))
+    print("{:<8} {:<10}".format('-' * 8, '-' * 10))
+    print("{:<8} {:<10.4f}".format('while', while_time))
+    print("{:<8} {:<10.4f}".format('range', range_time))
+    print(f"\nCounted cycles run {while_time / range_time:.2f}x as fast.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+import argparse
+import functools
+import os
+import tempfile
+
+from benchmarks.calls import GenerateRecursiveProgram
+from benchmarks.loops import MeasureRun
+from tools.translator import *
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares recursive functions translated with and without the cache.")
+    parser.add_argument("--size", type=int, default=25, help="number of the fibonacci number computed recursively")
+    parser.add_argument("--repeat", type=int, default=3, help="runs of the program, the fastest one is taken")
+    args = parser.parse_args()
+
+    with tempfile.NamedTemporaryFile("w", suffix=".cpp", delete=False) as file:
+        file.write(GenerateRecursiveProgram(args.size))
+
+    try:
+        plain_time = MeasureRun(Translator, file.name, args.repeat)
+        memo_time = MeasureRun(functools.partial(Translator, memoize=True), file.name, args.repeat)
+    finally:
+        os.remove(file.name)
+
+    print("{:<8} {:<10}".format('CALLS', 'TIME'))
+    print("{:<8} {:<10}".format('-' * 8, '-' * 10))
+    print("{:<8} {:<10.4f}".format('plain', plain_time))
+    print("{:<8} {:<10.4f}".format('memo', memo_time))
+    print(f"\nMemoized functions run {plain_time / memo_time:.0f}x as fast.")
+
+
+if __name__ == '__main__':
+    main()
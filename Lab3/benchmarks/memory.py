@@ -0,0 +1,76 @@
+import sys
+import tracemalloc
+from dataclasses import dataclass
+
+from core.tree import *
+from core.tables import *
+
+
+class DictSyntaxTreeNode:
+    """
+        Syntax tree node as it was before slots: __dict__-backed with the eager children list.
+    """
+
+    def __init__(self, lexeme, type=SyntaxTreNodeTypes.COMMON):
+        self.Lexeme = lexeme
+        self.Children = []
+        self.Type = type
+
+    def AddChild(self, node):
+        self.Children.append(node)
+
+
+@dataclass()
+class DictLexTableItem:
+    """
+        Lexeme table item as it was before slots: __dict__-backed.
+    """
+
+    itemType: Language.LexemeTypes
+    itemValue: int
+    coordinate_line: int
+    coordinate_offset: int
+
+
+def MeasureBytesPerNode(node_class, lexeme_class, count):
+    """
+        Builds binary syntax tree of the given size and returns the amount of bytes per node (with its lexeme).
+    """
+
+    tracemalloc.start()
+    start = tracemalloc.take_snapshot()
+
+    nodes = []
+    for i in range(count):
+        node = node_class(lexeme_class(Language.LexemeTypes.INT_NUM, i, i, i))
+
+        # Every second node is a leaf, so every odd node gets two children
+        if i % 2 and len(nodes) > 1:
+            node.AddChild(nodes[-1])
+            node.AddChild(nodes[-2])
+        nodes.append(node)
+
+    end = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    allocated = sum(stat.size_diff for stat in end.compare_to(start, 'filename'))
+    allocated -= sys.getsizeof(nodes)
+
+    return allocated / count
+
+
+def main():
+    count = 200000
+
+    before = MeasureBytesPerNode(DictSyntaxTreeNode, DictLexTableItem, count)
+    after = MeasureBytesPerNode(SyntaxTreeNode, LexTableItem, count)
+
+    print("{:<10} {:<16}".format('LAYOUT', 'BYTES PER NODE'))
+    print("{:<10} {:<16}".format('-' * 10, '-' * 16))
+    print("{:<10} {:<16.1f}".format('dict', before))
+    print("{:<10} {:<16.1f}".format('slots', after))
+    print(f"\nSaved {100 * (1 - after / before):.1f}% of memory on {count} nodes.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+import argparse
+import os
+import tempfile
+
+from benchmarks.loops import MeasureRun
+from tools.translator import *
+
+
+class PrintTranslator(Translator):
+    """
+        Translator as it was before the buffered output: every cout statement becomes print with its operands.
+    """
+
+    def ParseCoutStatement(self, cout_node):
+        messages = []
+
+        for node in cout_node.GetChildren():
+            lexeme = node.GetLexeme()
+
+            if lexeme is not None and lexeme.itemValue == Language.KeyWords.ENDL:
+                messages.append(ast.Constant(value="\n"))
+            else:
+                messages.append(self.ParseExpression(node))
+
+        call = ast.Call(func=ast.Name(id="print", ctx=ast.Load()), args=messages,
+                        keywords=[ast.keyword(arg="end", value=ast.Constant(value=""))])
+
+        return [ast.Expr(value=call)]
+
+
+def GenerateOutputProgram(size):
+    """
+        Generates CPP program printing the given amount of lines.
+    """
+
+    return "\n".join([
+        "#include <iostream>",
+        "using namespace std;",
+        "int main()",
+        "{",
+        "    int s;",
+        f"    for (int i = 0; i < {size}; i++)",
+        "    {",
+        "        s = i * i;",
+        "        cout << i << \" \" << s << endl;",
+        "    }",
+        "    return 0;",
+        "}",
+        ""
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares cout translated to print and to the buffered output.")
+    parser.add_argument("--size", type=int, default=200000, help="amount of the printed lines")
+    parser.add_argument("--repeat", type=int, default=3, help="runs of the program, the fastest one is taken")
+    args = parser.parse_args()
+
+    with tempfile.NamedTemporaryFile("w", suffix=".cpp", delete=False) as file:
+        file.write(GenerateOutputProgram(args.size))
+
+    try:
+        print_time = MeasureRun(PrintTranslator, file.name, args.repeat)
+        buffered_time = MeasureRun(Translator, file.name, args.repeat)
+    finally:
+        os.remove(file.name)
+
+    print("{:<9} {:<10}".format('OUTPUT', 'TIME'))
+    print("{:<9} {:<10}".format('-' * 9, '-' * 10))
+    print("{:<9} {:<10.4f}".format('print', print_time))
+    print("{:<9} {:<10.4f}".format('buffered', buffered_time))
+    print(f"\nBuffered output runs {print_time / buffered_time:.2f}x as fast.")
+
+
+if __name__ == '__main__':
+    main()
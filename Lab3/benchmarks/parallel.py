@@ -0,0 +1,47 @@
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.incremental import ParseProgram
+from benchmarks.pipeline import GenerateProgram
+from tools.semantic_parser import *
+
+
+def MeasureSemantic(file_name, workers):
+    """
+        Parses the file and returns the time of its semantic analysis with the given amount of workers.
+    """
+
+    root, literal_table, variable_view = ParseProgram(file_name)
+
+    start = time.perf_counter()
+    SemanticParser(file_name, root, literal_table, variable_view, workers=workers)
+
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares sequential and parallel semantic analysis.")
+    parser.add_argument("--size", type=int, default=128, help="amount of the functions in the generated program")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="amount of the worker processes")
+    args = parser.parse_args()
+
+    with tempfile.NamedTemporaryFile("w", suffix=".cpp", delete=False) as file:
+        file.write(GenerateProgram(args.size))
+
+    try:
+        sequential = MeasureSemantic(file.name, None)
+        parallel = MeasureSemantic(file.name, args.workers)
+    finally:
+        os.remove(file.name)
+
+    print("{:<12} {:<10}".format('MODE', 'TIME'))
+    print("{:<12} {:<10}".format('-' * 12, '-' * 10))
+    print("{:<12} {:<10.4f}".format('sequential', sequential))
+    print("{:<12} {:<10.4f}".format(f'{args.workers} workers', parallel))
+    print(f"\nParallel analysis is {sequential / parallel:.2f}x as fast as sequential.")
+
+
+if __name__ == '__main__':
+    main()
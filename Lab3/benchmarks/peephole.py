@@ -0,0 +1,150 @@
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.calls import GenerateRecursiveProgram
+from benchmarks.incremental import ParseProgram
+from benchmarks.loops import GenerateLoopProgram
+from benchmarks.output import GenerateOutputProgram
+from benchmarks.pipeline import GenerateProgram
+from benchmarks.vectorize import GenerateArrayProgram
+from tools.optimizer import *
+from tools.semantic_parser import *
+from tools.translator import *
+
+# Directory of the programs with their input and expected output: NAME.cpp, NAME.in, NAME.out
+golden_directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden")
+
+
+def GetGoldenPrograms():
+    """
+        Gets the programs whose output must not change with the peephole optimization: name -> CPP source.
+    """
+
+    with open("main.cpp") as file:
+        programs = {"main.cpp": file.read()}
+
+    programs["loops"] = GenerateLoopProgram(300)
+    programs["calls"] = GenerateRecursiveProgram(20)
+    programs["output"] = GenerateOutputProgram(20000)
+    programs["arrays"] = GenerateArrayProgram(20000)
+    programs["pipeline"] = GenerateProgram(16)
+
+    return programs
+
+
+def GetGoldenCases():
+    """
+        Gets the programs with the fixed expected output: name -> (CPP file name, input, expected output).
+        Expected outputs are the outputs of the programs compiled with g++. The programs printing the result of the
+        division give the float Python prints, their output comes from the translation without the options.
+    """
+
+    cases = {}
+
+    for name in sorted(os.listdir(golden_directory)):
+        if not name.endswith(".cpp"):
+            continue
+
+        case = os.path.join(golden_directory, name[:-len(".cpp")])
+        with open(case + ".in") as file:
+            input_text = file.read()
+        with open(case + ".out") as file:
+            expected = file.read()
+
+        cases[name[:-len(".cpp")]] = (case + ".cpp", input_text, expected)
+
+    return cases
+
+
+def RunProgram(file_name, peephole, repeat, input_text="", checked=False, vectorize=False):
+    """
+        Translates the program and returns its output on the given input and the best time of its runs.
+        If checked is set, the semantic analysis and the tree optimizer run first like in main.py, their error message
+        is returned as the output. If vectorize is set, the array cycles are translated to NumPy slice operations.
+    """
+
+    root, literal_table, variable_view = ParseProgram(file_name)
+    stdin = sys.stdin
+
+    if checked:
+        try:
+            SemanticParser(file_name, root, literal_table, variable_view)
+            TreeOptimizer(file_name, root, literal_table, variable_view)
+        except SemanticError as ex:
+            return f"{ex}\n", None
+
+    try:
+        # The translator runs the program once itself
+        with contextlib.redirect_stdout(io.StringIO()):
+            sys.stdin = io.StringIO(input_text)
+            code = Translator(root, literal_table, variable_view, print_code=False, peephole=peephole,
+                              vectorize=vectorize).GetCode()
+
+        best = None
+        for _ in range(repeat):
+            output = io.StringIO()
+            sys.stdin = io.StringIO(input_text)
+            with contextlib.redirect_stdout(output):
+                start = time.perf_counter()
+                RunTranslatedCode(code)
+                elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        sys.stdin = stdin
+
+    return output.getvalue(), best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Checks the peephole optimization keeps the output of the programs.")
+    parser.add_argument("--repeat", type=int, default=5, help="runs of every program, the fastest one is taken")
+    args = parser.parse_args()
+
+    print("{:<10} {:<8} {:<10} {:<10}".format('PROGRAM', 'OUTPUT', 'PLAIN', 'PEEPHOLE'))
+    print("{:<10} {:<8} {:<10} {:<10}".format('-' * 10, '-' * 8, '-' * 10, '-' * 10))
+
+    failed = 0
+
+    for name, source in GetGoldenPrograms().items():
+        with tempfile.NamedTemporaryFile("w", suffix=".cpp", delete=False) as file:
+            file.write(source)
+
+        try:
+            plain_output, plain_time = RunProgram(file.name, False, args.repeat)
+            peephole_output, peephole_time = RunProgram(file.name, True, args.repeat)
+        finally:
+            os.remove(file.name)
+
+        same = plain_output == peephole_output
+        failed += not same
+
+        print("{:<10} {:<8} {:<10.4f} {:<10.4f}".format(name, 'same' if same else 'CHANGED', plain_time,
+                                                        peephole_time))
+
+    print()
+    print("{:<10} {:<8} {:<10} {:<10} {:<10}".format('CASE', 'PLAIN', 'PEEPHOLE', 'CHECKED', 'VECTORIZE'))
+    print("{:<10} {:<8} {:<10} {:<10} {:<10}".format('-' * 10, '-' * 8, '-' * 10, '-' * 10, '-' * 10))
+
+    for name, (file_name, input_text, expected) in GetGoldenCases().items():
+        outputs = [RunProgram(file_name, False, 1, input_text)[0],
+                   RunProgram(file_name, True, 1, input_text)[0],
+                   RunProgram(file_name, True, 1, input_text, checked=True)[0],
+                   RunProgram(file_name, True, 1, input_text, checked=True, vectorize=True)[0]]
+
+        failed += sum(output != expected for output in outputs)
+
+        print("{:<10} {:<8} {:<10} {:<10} {:<10}".format(name, *['ok' if output == expected else 'WRONG'
+                                                                 for output in outputs]))
+
+    if failed:
+        print(f"\n{failed} outputs changed or differ from the expected ones.")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,187 @@
+import argparse
+import contextlib
+import io
+import math
+import os
+import sys
+import tempfile
+import time
+
+from tools.analyzer import *
+from tools.optimizer import *
+from tools.translator import *
+from tools.tree_parser import *
+from tools.semantic_parser import *
+
+# Stages of the translation pipeline in the order of execution
+stages = ["Lexer", "Parser", "Semantic", "Optimizer", "Translator"]
+
+
+def GenerateFunction(index, variables, depth):
+    """
+        Generates CPP function with the given amount of local variables and nesting depth of the statements.
+    """
+
+    lines = [f"int func{index}(int a, int b)", "{"]
+
+    # Local variables chained one by another
+    lines.append(f"    int v{index}_0 = a + b * 2;")
+    for i in range(1, variables):
+        lines.append(f"    int v{index}_{i} = v{index}_{i - 1} * 3 % 7 + a - {i};")
+
+    # Nested statements using the local variables
+    last = f"v{index}_{variables - 1}"
+    for level in range(depth):
+        indent = "    " * (level + 1)
+        statement = ["if", "while", "for"][level % 3]
+
+        if statement == "if":
+            lines.append(f"{indent}if ({last} > {level})")
+        elif statement == "while":
+            lines.append(f"{indent}while ({last} < {level})")
+        else:
+            lines.append(f"{indent}for (int i{index}_{level} = 0; i{index}_{level} < 2; i{index}_{level}++)")
+        lines.append(f"{indent}{{")
+        lines.append(f"{indent}    {last} = {last} + b % 2 + {level + 1};")
+
+    for level in reversed(range(depth)):
+        lines.append("    " * (level + 1) + "}")
+
+    lines.append(f"    return {last};")
+    lines.append("}")
+
+    return lines
+
+
+def GenerateProgram(size):
+    """
+        Generates CPP program of the given size: more functions, deeper nesting and more variables as size grows.
+    """
+
+    functions = size
+    variables = 4 + size.bit_length()
+    depth = 1 + size.bit_length() // 2
+
+    lines = ["#include <iostream>", "using namespace std;", ""]
+    for i in range(functions):
+        lines.extend(GenerateFunction(i, variables, depth))
+        lines.append("")
+
+    # Main function calling every generated function
+    lines.extend(["int main()", "{", "    int result;", "    result = 0;"])
+    for i in range(functions):
+        lines.append(f"    result = result + func{i}({i}, result % 5);")
+    lines.extend(["    cout << result << endl;", "    return 0;", "}"])
+
+    return "\n".join(lines) + "\n"
+
+
+def RunPipeline(file_name):
+    """
+        Runs the whole pipeline on the given file and returns the amount of lexemes and the time of every stage.
+    """
+
+    timings = {}
+    literal_table = LiteralTable()
+    variable_table = []
+
+    start = time.perf_counter()
+    lexemes = LexicalAnalyzer(file_name, literal_table, variable_table).GetLexemes()
+    timings["Lexer"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    root = TreeParser(file_name, lexemes, literal_table, variable_table).GetTree()
+    timings["Parser"] = time.perf_counter() - start
+
+    variable_table = [var for var in variable_table if var.itemType != Language.VariableTypes.UNKNOWN]
+    variable_view = VariableTableView(variable_table)
+
+    start = time.perf_counter()
+    SemanticParser(file_name, root, literal_table, variable_view)
+    timings["Semantic"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    TreeOptimizer(file_name, root, literal_table, variable_view)
+    timings["Optimizer"] = time.perf_counter() - start
+
+    # Translated code and program output are not a part of the measurement
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        Translator(root, literal_table, variable_view, print_code=False)
+    timings["Translator"] = time.perf_counter() - start
+
+    return len(lexemes), timings
+
+
+def FitExponent(sizes, times):
+    """
+        Fits the growth exponent k of the time = c * size^k model with least squares in log-log scale.
+    """
+
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(max(t, 1e-9)) for t in times]
+    x_mean = sum(xs) / len(xs)
+    y_mean = sum(ys) / len(ys)
+
+    numerator = sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys))
+    denominator = sum((x - x_mean) ** 2 for x in xs)
+
+    return numerator / denominator
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measures how every stage of the pipeline scales with input size.")
+    parser.add_argument("--start", type=int, default=8, help="size of the smallest generated program")
+    parser.add_argument("--steps", type=int, default=5, help="amount of the size doublings")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per size, the fastest one is taken")
+    parser.add_argument("--bound", type=float, default=1.3, help="maximal allowed growth exponent of a stage")
+    args = parser.parse_args()
+
+    sizes = []
+    results = {stage: [] for stage in stages}
+
+    header_format = "{:<6} {:<10}" + " {:<12}" * len(stages)
+    row_format = "{:<6} {:<10}" + " {:<12.4f}" * len(stages)
+
+    print(header_format.format('SIZE', 'LEXEMES', *stages))
+    print(header_format.format('-' * 6, '-' * 10, *['-' * 12] * len(stages)))
+
+    for step in range(args.steps):
+        size = args.start * 2 ** step
+
+        with tempfile.NamedTemporaryFile("w", suffix=".cpp", delete=False) as file:
+            file.write(GenerateProgram(size))
+
+        try:
+            best = {stage: math.inf for stage in stages}
+            for _ in range(args.repeat):
+                lexemes, timings = RunPipeline(file.name)
+                for stage in stages:
+                    best[stage] = min(best[stage], timings[stage])
+        finally:
+            os.remove(file.name)
+
+        sizes.append(lexemes)
+        for stage in stages:
+            results[stage].append(best[stage])
+
+        print(row_format.format(size, lexemes, *[best[stage] for stage in stages]))
+
+    # Check growth of every stage against the bound
+    print()
+    failed = []
+    for stage in stages:
+        exponent = FitExponent(sizes, results[stage])
+        status = "OK" if exponent <= args.bound else "FAIL"
+        print("{:<12} exponent {:<6.2f} {}".format(stage, exponent, status))
+
+        if exponent > args.bound:
+            failed.append(stage)
+
+    if failed:
+        print(f"\nStages growing worse than n^{args.bound}: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
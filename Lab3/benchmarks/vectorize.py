@@ -0,0 +1,73 @@
+import argparse
+import functools
+import os
+import tempfile
+
+from benchmarks.loops import MeasureRun
+from tools.translator import *
+
+
+def GenerateArrayProgram(size):
+    """
+        Generates CPP program with the item by item cycles and the reduction over the arrays of the given size.
+    """
+
+    return "\n".join([
+        "#include <iostream>",
+        "using namespace std;",
+        "int main()",
+        "{",
+        f"    int a[{size}];",
+        f"    double b[{size}];",
+        "    int n, k;",
+        "    double s;",
+        f"    n = {size};",
+        "    k = 3;",
+        "    s = 0;",
+        "    for (int i = 0; i < n; i++)",
+        "    {",
+        "        a[i] = i;",
+        "    }",
+        "    for (int j = 0; j < n; j++)",
+        "    {",
+        "        b[j] = a[j] * k + 1;",
+        "    }",
+        "    for (int m = 0; m < n; m++)",
+        "    {",
+        "        s = s + b[m] * 2;",
+        "    }",
+        "    cout << s << endl;",
+        "    return 0;",
+        "}",
+        ""
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares array cycles translated to scalar ones and to NumPy slices.")
+    parser.add_argument("--size", type=int, default=1000000, help="amount of the items in the arrays")
+    parser.add_argument("--repeat", type=int, default=3, help="runs of the program, the fastest one is taken")
+    args = parser.parse_args()
+
+    if not numpy_available:
+        print("NumPy is not installed, the array cycles cannot be vectorized.")
+        return
+
+    with tempfile.NamedTemporaryFile("w", suffix=".cpp", delete=False) as file:
+        file.write(GenerateArrayProgram(args.size))
+
+    try:
+        scalar_time = MeasureRun(Translator, file.name, args.repeat)
+        vector_time = MeasureRun(functools.partial(Translator, vectorize=True), file.name, args.repeat)
+    finally:
+        os.remove(file.name)
+
+    print("{:<8} {:<10}".format('CYCLE', 'TIME'))
+    print("{:<8} {:<10}".format('-' * 8, '-' * 10))
+    print("{:<8} {:<10.4f}".format('scalar', scalar_time))
+    print("{:<8} {:<10.4f}".format('numpy', vector_time))
+    print(f"\nVectorized cycles run {scalar_time / vector_time:.1f}x as fast.")
+
+
+if __name__ == '__main__':
+    main()
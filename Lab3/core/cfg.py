@@ -0,0 +1,283 @@
+from collections import deque
+
+from core.tree import *
+
+
+class BasicBlock:
+    """
+        Basic block of the control flow graph: statement nodes executed one by one.
+    """
+
+    __slots__ = ('Id', 'Statements', 'Successors', 'Predecessors')
+
+    def __init__(self, id):
+        self.Id = id
+        self.Statements = []
+        self.Successors = []
+        self.Predecessors = []
+
+    def AddStatement(self, node):
+        self.Statements.append(node)
+
+
+class ControlFlowGraph:
+    """
+        Control flow graph of the function built over the syntax tree statements.
+    """
+
+    def __init__(self):
+        self.Blocks = []
+        self.Entry = self.NewBlock()
+        self.Exit = self.NewBlock()
+
+    def NewBlock(self):
+        """
+            Creates a new basic block of the graph.
+        """
+
+        block = BasicBlock(len(self.Blocks))
+        self.Blocks.append(block)
+
+        return block
+
+    def AddEdge(self, source, target):
+        """
+            Connects two blocks with the control flow edge.
+        """
+
+        source.Successors.append(target)
+        target.Predecessors.append(source)
+
+
+class ControlFlowGraphBuilder:
+    """
+        Builds the control flow graph of the function declaration: conditions and simple statements are placed into
+        basic blocks, if / while / do-while / for / break / continue / return / exit define the edges.
+    """
+
+    def __init__(self, function_node, literal_table=None):
+        """
+            Initializes the builder and builds the graph of the provided function declaration node. Number literals
+            of the cycle conditions are read from the given literal table.
+        """
+
+        self.Graph = ControlFlowGraph()
+        self.LiteralTable = literal_table
+
+        # Targets of the enclosing loops: (continue target, break target)
+        self.Loops = []
+
+        end = self.AddStatement(function_node.GetChildren()[3], self.Graph.Entry)
+        if end is not None:
+            self.Graph.AddEdge(end, self.Graph.Exit)
+
+    def GetGraph(self):
+        """
+            Returns the built control flow graph.
+        """
+
+        return self.Graph
+
+    def AddStatement(self, node, block):
+        """
+            Adds the statement to the graph starting at the given block, returns the block control continues from or
+            None if the statement never passes control further.
+        """
+
+        if node is None:
+            return block
+
+        # Statements after break / continue / return are unreachable: they get a block without predecessors
+        if block is None:
+            block = self.Graph.NewBlock()
+
+        lexeme = node.GetLexeme()
+        kind = node.Type if lexeme is None else lexeme.itemValue
+
+        if kind == SyntaxTreNodeTypes.CODE_BLOCK:
+            for child in node.GetChildren():
+                block = self.AddStatement(child, block)
+            return block
+        elif kind == Language.KeyWords.IF:
+            return self.AddIf(node, block)
+        elif kind == Language.KeyWords.WHILE:
+            return self.AddWhile(node, block)
+        elif kind == Language.KeyWords.DO:
+            return self.AddDoWhile(node, block)
+        elif kind == Language.KeyWords.FOR:
+            return self.AddFor(node, block)
+        elif kind in [Language.KeyWords.BREAK, Language.KeyWords.CONTINUE]:
+            if self.Loops:
+                continue_target, break_target = self.Loops[-1]
+                target = break_target if kind == Language.KeyWords.BREAK else continue_target
+                self.Graph.AddEdge(block, target)
+            return None
+        elif kind in [Language.KeyWords.RETURN, Language.KeyWords.EXIT]:
+            block.AddStatement(node)
+            self.Graph.AddEdge(block, self.Graph.Exit)
+            return None
+
+        block.AddStatement(node)
+        return block
+
+    def AddIf(self, if_node, block):
+        """
+            Adds the if statement: condition, then and optional else branches joined after.
+        """
+
+        children = if_node.GetChildren()
+        block.AddStatement(children[0])
+        join = self.Graph.NewBlock()
+
+        for branch in children[1:]:
+            branch_block = self.Graph.NewBlock()
+            self.Graph.AddEdge(block, branch_block)
+            end = self.AddStatement(branch, branch_block)
+            if end is not None:
+                self.Graph.AddEdge(end, join)
+
+        # No else branch: condition may pass control directly after the statement
+        if len(children) < 3:
+            self.Graph.AddEdge(block, join)
+
+        return join
+
+    def AddWhile(self, while_node, block):
+        """
+            Adds the while cycle: condition head, optional body and exit after the cycle.
+        """
+
+        children = while_node.GetChildren()
+        head = self.Graph.NewBlock()
+        after = self.Graph.NewBlock()
+
+        self.Graph.AddEdge(block, head)
+        head.AddStatement(children[0])
+        if not self.IsAlwaysTrue(children[0]):
+            self.Graph.AddEdge(head, after)
+
+        body = self.Graph.NewBlock()
+        self.Graph.AddEdge(head, body)
+        end = self.AddLoopBody(children[1] if len(children) > 1 else None, body, head, after)
+        if end is not None:
+            self.Graph.AddEdge(end, head)
+
+        return after
+
+    def AddDoWhile(self, do_while_node, block):
+        """
+            Adds the do-while cycle: body, condition tail and exit after the cycle.
+        """
+
+        code_node, while_node = do_while_node.GetChildren()
+        body = self.Graph.NewBlock()
+        tail = self.Graph.NewBlock()
+        after = self.Graph.NewBlock()
+
+        self.Graph.AddEdge(block, body)
+        end = self.AddLoopBody(code_node, body, tail, after)
+        if end is not None:
+            self.Graph.AddEdge(end, tail)
+
+        tail.AddStatement(while_node.GetChildren()[0])
+        self.Graph.AddEdge(tail, body)
+        if not self.IsAlwaysTrue(while_node.GetChildren()[0]):
+            self.Graph.AddEdge(tail, after)
+
+        return after
+
+    def AddFor(self, for_node, block):
+        """
+            Adds the for cycle: init, condition head, body, variable change tail and exit after the cycle.
+        """
+
+        init_node, condition_node, step_node, code_node = for_node.GetChildren()
+        block = self.AddStatement(init_node, block)
+
+        head = self.Graph.NewBlock()
+        tail = self.Graph.NewBlock()
+        after = self.Graph.NewBlock()
+
+        self.Graph.AddEdge(block, head)
+        if condition_node is not None:
+            head.AddStatement(condition_node)
+            self.Graph.AddEdge(head, after)
+
+        body = self.Graph.NewBlock()
+        self.Graph.AddEdge(head, body)
+        end = self.AddLoopBody(code_node, body, tail, after)
+        if end is not None:
+            self.Graph.AddEdge(end, tail)
+
+        tail = self.AddStatement(step_node, tail)
+        self.Graph.AddEdge(tail, head)
+
+        return after
+
+    def IsAlwaysTrue(self, condition_node):
+        """
+            Checks the cycle condition to be true or a nonzero number literal: the cycle is left only by a jump then.
+        """
+
+        lexeme = condition_node.GetLexeme()
+        if lexeme is None or condition_node.GetChildren():
+            return False
+
+        if lexeme.itemType == Language.LexemeTypes.KEY_WORD and lexeme.itemValue == Language.KeyWords.TRUE:
+            return True
+        if lexeme.itemType in [Language.LexemeTypes.INT_NUM, Language.LexemeTypes.DOUBLE_NUM] \
+                and self.LiteralTable is not None:
+            return float(self.LiteralTable.get(lexeme.itemValue).itemValue) != 0
+
+        return False
+
+    def AddLoopBody(self, node, block, continue_target, break_target):
+        """
+            Adds the cycle body with the given continue and break targets.
+        """
+
+        self.Loops.append((continue_target, break_target))
+        end = self.AddStatement(node, block)
+        self.Loops.pop()
+
+        return end
+
+
+def SolveForwardDataflow(graph, gen, kill, entry_value, initial_value, must=True):
+    """
+        Solves the forward dataflow problem over the int bit vectors with the worklist algorithm.
+        Transfer function of the block is OUT = GEN | (IN & ~KILL), predecessors are met with AND for the must
+        problems and with OR for the may problems. Returns IN and OUT vectors indexed by block id.
+    """
+
+    blocks = graph.Blocks
+    block_in = [initial_value] * len(blocks)
+    block_out = [initial_value] * len(blocks)
+    block_in[graph.Entry.Id] = entry_value
+
+    worklist = deque(blocks)
+    queued = [True] * len(blocks)
+
+    while worklist:
+        block = worklist.popleft()
+        queued[block.Id] = False
+
+        # Meet the predecessors, entry and unreachable blocks keep their value
+        if block is not graph.Entry and block.Predecessors:
+            value = block_out[block.Predecessors[0].Id]
+            for predecessor in block.Predecessors[1:]:
+                if must:
+                    value &= block_out[predecessor.Id]
+                else:
+                    value |= block_out[predecessor.Id]
+            block_in[block.Id] = value
+
+        out = gen[block.Id] | (block_in[block.Id] & ~kill[block.Id])
+        if out != block_out[block.Id]:
+            block_out[block.Id] = out
+            for successor in block.Successors:
+                if not queued[successor.Id]:
+                    queued[successor.Id] = True
+                    worklist.append(successor)
+
+    return block_in, block_out
@@ -184,6 +184,27 @@ def IsMultiplicationOperator(operator):
 
     return operator in [Language.Operators.MULTIPLY, Language.Operators.SLASH, Language.Operators.PERCENT]
 
+
+literal_types = {
+    Language.LexemeTypes.INT_NUM: Language.VariableTypes.INT,
+    Language.LexemeTypes.DOUBLE_NUM: Language.VariableTypes.DOUBLE,
+    Language.LexemeTypes.STRING: Language.VariableTypes.STRING
+}
+
+bool_literals = frozenset((Language.KeyWords.TRUE, Language.KeyWords.FALSE))
+
+bool_operators = frozenset((
+    Language.Operators.DOUBLE_EQUAL,
+    Language.Operators.NOT_EQUAL,
+    Language.Operators.LESS,
+    Language.Operators.LESS_EQUAL,
+    Language.Operators.GREATER,
+    Language.Operators.GREATER_EQUAL,
+    Language.Operators.LOGICAL_AND,
+    Language.Operators.LOGICAL_OR,
+    Language.Operators.NOT
+))
+
 inverted_operators = {
     Language.Operators.DOUBLE_EQUAL: '==',
     Language.Operators.NOT_EQUAL: '!=',
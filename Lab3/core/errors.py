@@ -71,6 +71,22 @@ class SemanticError(Exception):
         self.ErrorMessage = f'File "{file_name}" [{str(coordinate_line)}:{str(coordinate_offset)}]: error: {message}'
         super().__init__(self.ErrorMessage)
 
+    def __reduce__(self):
+        # Errors of the subclasses are rebuilt from the formatted message when passed between processes
+        return RestoreSemanticError, (type(self), self.ErrorMessage)
+
+
+def RestoreSemanticError(error_type, message):
+    """
+        Creates the semantic error of the given type with the already formatted message.
+    """
+
+    error = Exception.__new__(error_type)
+    Exception.__init__(error, message)
+    error.ErrorMessage = message
+
+    return error
+
 
 class DivisionByZeroError(SemanticError):
     def __init__(self, file_name, coordinate_line, coordinate_offset):
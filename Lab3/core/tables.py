@@ -2,15 +2,22 @@ from core.language import *
 from dataclasses import dataclass
 
 
-@dataclass()
+@dataclass(frozen=True)
 class LiteralTableItem:
+    __slots__ = ('itemId', 'itemType', 'itemValue')
+
     itemId: int
     itemType: Language.LiteralTypes
     itemValue: str
 
+    def __reduce__(self):
+        return LiteralTableItem, (self.itemId, self.itemType, self.itemValue)
+
 
 @dataclass()
 class VariableTableItem:
+    __slots__ = ('itemId', 'itemBlockId', 'itemBlockLevel', 'itemName', 'itemType')
+
     itemId: int
     itemBlockId: int
     itemBlockLevel: int
@@ -18,8 +25,24 @@ class VariableTableItem:
     itemType: Language.VariableTypes or []
 
 
+@dataclass(frozen=True)
+class FunctionTableItem:
+    __slots__ = ('itemId', 'itemName', 'itemType', 'itemArity', 'itemArguments')
+
+    itemId: int
+    itemName: str
+    itemType: Language.VariableTypes
+    itemArity: int
+    itemArguments: tuple
+
+    def __reduce__(self):
+        return FunctionTableItem, (self.itemId, self.itemName, self.itemType, self.itemArity, self.itemArguments)
+
+
 @dataclass()
 class LexTableItem:
+    __slots__ = ('itemType', 'itemValue', 'coordinate_line', 'coordinate_offset')
+
     itemType: Language.LexemeTypes
     itemValue: int or Language.KeyWords or Language.Delimiters or Language.Operators
     coordinate_line: int
@@ -45,3 +68,43 @@ class LiteralTable:
 
     def get(self, id) -> LiteralTableItem:
         return self.Literals[id]
+
+
+class FunctionTable:
+    def __init__(self):
+        self.Functions = {}
+
+    def push(self, item):
+        self.Functions[item.itemId] = item
+
+    def get(self, id) -> FunctionTableItem:
+        return self.Functions[id]
+
+    def __contains__(self, id):
+        return id in self.Functions
+
+
+class VariableTableView:
+    def __init__(self, variables):
+        self.Variables = variables
+        self.IdToTableItem = {variable.itemId: variable for variable in variables}
+
+    def get(self, id) -> VariableTableItem:
+        return self.IdToTableItem[id]
+
+    def __iter__(self):
+        return iter(self.Variables)
+
+    def __len__(self):
+        return len(self.Variables)
+
+
+def GetVariableTableView(variable_table) -> VariableTableView:
+    """
+        Returns the id-indexed view of the variable table, reusing the given table if it is already a view.
+    """
+
+    if isinstance(variable_table, VariableTableView):
+        return variable_table
+
+    return VariableTableView(variable_table)
@@ -1,3 +1,6 @@
+import io
+import sys
+
 from core.checks import IsKeyword
 from core.language import *
 from core.tables import VariableTableItem
@@ -12,14 +15,23 @@ class SyntaxTreNodeTypes(Enum):
     CODE_BLOCK = 5
 
 
+# Shared children placeholder of the leaf nodes: the list is allocated on the first AddChild only
+NO_CHILDREN = ()
+
+
 class SyntaxTreeNode:
+    __slots__ = ('Lexeme', 'Children', 'Type')
+
     def __init__(self, lexeme, type=SyntaxTreNodeTypes.COMMON):
         self.Lexeme = lexeme
-        self.Children = []
+        self.Children = NO_CHILDREN
         self.Type = type
 
     def AddChild(self, node):
-        self.Children.append(node)
+        if self.Children is NO_CHILDREN:
+            self.Children = [node]
+        else:
+            self.Children.append(node)
 
     def GetChildren(self):
         return self.Children
@@ -44,14 +56,47 @@ class SyntaxTreeNode:
             return str(self.Lexeme.itemValue)
 
 
-def printSyntaxTree(root, depth: int = 0):
+# Type keywords which are skipped in the printed tree
+type_key_words = frozenset((Language.KeyWords.VOID, Language.KeyWords.INT, Language.KeyWords.DOUBLE,
+                            Language.KeyWords.STRING, Language.KeyWords.BOOL))
+
+
+def iterSyntaxTree(root):
+    """
+        Yields the lines of the printed syntax tree walking it with an explicit stack.
+    """
+
     if root is None:
         return
 
-    print('\t' * depth + str(root))
-    for child in root.GetChildren():
-        # Skip types
-        if child and child.GetLexeme() and str(child.GetLexeme().itemValue) \
-                in ["KeyWords.VOID", "KeyWords.INT", "KeyWords.DOUBLE", "KeyWords.STRING", "KeyWords.BOOL"]:
-            continue
-        printSyntaxTree(child, depth + 1)
+    stack = [(root, 0)]
+    while stack:
+        node, depth = stack.pop()
+        yield '\t' * depth + str(node)
+
+        # Push children in reverse order to visit them from left to right
+        for child in reversed(node.GetChildren()):
+            if child is None:
+                continue
+
+            # Skip types
+            lexeme = child.GetLexeme()
+            if lexeme and lexeme.itemValue in type_key_words:
+                continue
+            stack.append((child, depth + 1))
+
+
+def printSyntaxTree(root, stream=None):
+    """
+        Prints the syntax tree into the given text stream (stdout by default) with a single buffered write.
+    """
+
+    if stream is None:
+        stream = sys.stdout
+
+    buffer = io.StringIO()
+    for line in iterSyntaxTree(root):
+        buffer.write(line)
+        buffer.write('\n')
+
+    stream.write(buffer.getvalue())
@@ -0,0 +1,113 @@
+from core.language import *
+
+
+class CompoundType:
+    """
+        Interned immutable variable type built over the item type: array, pointer, reference or function.
+        Equal compound types are the same object, so they are compared by identity and used as dict keys.
+    """
+
+    __slots__ = ('Kind', 'Item')
+
+    # (kind, item type) -> compound type
+    Interned = {}
+
+    def __new__(cls, kind, item):
+        compound_type = cls.Interned.get((kind, item))
+
+        if compound_type is None:
+            compound_type = super().__new__(cls)
+            object.__setattr__(compound_type, 'Kind', kind)
+            object.__setattr__(compound_type, 'Item', item)
+            cls.Interned[(kind, item)] = compound_type
+
+        return compound_type
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Compound type is immutable")
+
+    def __reduce__(self):
+        return CompoundType, (self.Kind, self.Item)
+
+    def __repr__(self):
+        return f"[{self.Kind!r}, {self.Item!r}]"
+
+
+def ArrayOf(item_type):
+    return CompoundType(Language.VariableTypes.ARRAY, item_type)
+
+
+def PointerTo(item_type):
+    return CompoundType(Language.VariableTypes.POINTER, item_type)
+
+
+def ReferenceTo(item_type):
+    return CompoundType(Language.VariableTypes.REFERENCE, item_type)
+
+
+def FunctionReturning(item_type):
+    return CompoundType(Language.VariableTypes.FUNCTION, item_type)
+
+
+def GetTypeKind(variable_type):
+    """
+        Gets the kind of the type: ARRAY / POINTER / REFERENCE / FUNCTION for the compound types, the type itself
+        for the base ones.
+    """
+
+    if type(variable_type) is CompoundType:
+        return variable_type.Kind
+    return variable_type
+
+
+def GetItemType(variable_type):
+    """
+        Gets the item type of the compound type, the base type is its own item.
+    """
+
+    if type(variable_type) is CompoundType:
+        return variable_type.Item
+    return variable_type
+
+
+# Types values of which are stored in variables
+value_types = (Language.VariableTypes.INT, Language.VariableTypes.DOUBLE,
+               Language.VariableTypes.STRING, Language.VariableTypes.BOOL)
+
+# Types implicitly converted to each other in the expressions
+convertible_types = frozenset((Language.VariableTypes.BOOL, Language.VariableTypes.INT,
+                               Language.VariableTypes.DOUBLE))
+
+
+def BuildCompatibilityMatrix():
+    """
+        Builds the pairs (required type, provided type) of the types which can be passed one for another:
+        equal types and an array for a pointer to the same items.
+    """
+
+    matrix = set()
+
+    for item_type in value_types:
+        matrix.add((item_type, item_type))
+        for kind in [Language.VariableTypes.ARRAY, Language.VariableTypes.POINTER,
+                     Language.VariableTypes.REFERENCE, Language.VariableTypes.FUNCTION]:
+            compound_type = CompoundType(kind, item_type)
+            matrix.add((compound_type, compound_type))
+        matrix.add((PointerTo(item_type), ArrayOf(item_type)))
+
+    return frozenset(matrix)
+
+
+compatible_types = BuildCompatibilityMatrix()
+
+
+def IsCompatibleType(required_type, provided_type):
+    """
+        Checks the provided type can be passed where the required type is expected.
+    """
+
+    if (required_type, provided_type) in compatible_types:
+        return True
+
+    # Interned types nested deeper than the matrix are equal only if they are the same object
+    return required_type is provided_type and required_type is not None
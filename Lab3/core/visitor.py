@@ -0,0 +1,118 @@
+from core.tree import *
+
+# Handlers registered for this kind are called for every node
+ANY_NODE = None
+
+# Lexeme types whose nodes are told apart by the type, not by the value
+valued_lexeme_types = frozenset((Language.LexemeTypes.IDENTIFIER, Language.LexemeTypes.INT_NUM,
+                                 Language.LexemeTypes.DOUBLE_NUM, Language.LexemeTypes.STRING))
+
+
+def NodeKind(node):
+    """
+        Returns the kind of the syntax tree node used to dispatch handlers: node type, lexeme type or lexeme value.
+    """
+
+    lexeme = node.Lexeme
+    if lexeme is None:
+        return node.Type
+    if lexeme.itemType in valued_lexeme_types:
+        return lexeme.itemType
+    return lexeme.itemValue
+
+
+class TreePass:
+    """
+        Syntax tree pass: handlers registered per node kind are called on entering and leaving the node.
+    """
+
+    def __init__(self):
+        """
+            Initializes the pass with empty dispatch tables.
+        """
+
+        self.EnterHandlers = {}
+        self.LeaveHandlers = {}
+
+    def OnEnter(self, kind, handler):
+        """
+            Registers the handler called before the children of the node of provided kind are visited.
+        """
+
+        self.EnterHandlers.setdefault(kind, []).append(handler)
+
+    def OnLeave(self, kind, handler):
+        """
+            Registers the handler called after the children of the node of provided kind are visited.
+        """
+
+        self.LeaveHandlers.setdefault(kind, []).append(handler)
+
+
+class TreeWalker:
+    """
+        Iterative syntax tree walker running several passes fused in one traversal.
+    """
+
+    def __init__(self, passes):
+        """
+            Initializes the walker with the passes to run, handlers are called in the order of the passes.
+        """
+
+        self.Passes = passes
+
+        # Merged dispatch tables: node kind -> handlers of all passes
+        self.EnterHandlers = {}
+        self.LeaveHandlers = {}
+
+    def GetHandlers(self, kind, leave):
+        """
+            Merges the handlers of all passes for the node kind and caches the result.
+        """
+
+        cache = self.LeaveHandlers if leave else self.EnterHandlers
+        handlers = cache.get(kind)
+
+        if handlers is None:
+            handlers = []
+            for tree_pass in self.Passes:
+                table = tree_pass.LeaveHandlers if leave else tree_pass.EnterHandlers
+                handlers.extend(table.get(ANY_NODE, ()))
+                if kind is not ANY_NODE:
+                    handlers.extend(table.get(kind, ()))
+            handlers = tuple(handlers)
+            cache[kind] = handlers
+
+        return handlers
+
+    def Walk(self, root):
+        """
+            Walks the tree from the given root in depth-first order using an explicit stack.
+        """
+
+        # Stack items: node and whether the node is being left
+        stack = [(root, False)]
+
+        while stack:
+            node, leaving = stack.pop()
+
+            if node is None:
+                continue
+
+            kind = NodeKind(node)
+
+            if leaving:
+                for handler in self.GetHandlers(kind, True):
+                    handler(node)
+                continue
+
+            for handler in self.GetHandlers(kind, False):
+                handler(node)
+
+            # Come back to the node after its children only if someone waits for it
+            if self.GetHandlers(kind, True):
+                stack.append((node, True))
+
+            children = node.Children
+            for i in range(len(children) - 1, -1, -1):
+                stack.append((children[i], False))
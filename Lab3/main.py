@@ -1,4 +1,9 @@
+import argparse
+import os
+
 from tools.analyzer import *
+from tools.code_cache import *
+from tools.optimizer import *
 from tools.translator import *
 from tools.tree_parser import *
 from tools.semantic_parser import *
@@ -84,9 +89,67 @@ def printVariables(variables):
     br()
 
 
+def runProgram(fileName, args):
+    """
+        Runs the program without the analysis output. Compiled code is taken from the cache if the same program was
+        translated with the same options before, otherwise the program is translated and its code is cached.
+    """
+
+    cache = CodeCache(args.cache_dir)
+    options = {"vectorize": args.vectorize and numpy_available, "memoize": args.memoize, "peephole": args.peephole}
+    key = cache.GetKey(fileName, options)
+
+    code = cache.Get(key)
+    if code is not None:
+        RunTranslatedCode(code)
+        return
+
+    literalTable = LiteralTable()
+    variableTable = []
+
+    try:
+        lexemes = LexicalAnalyzer(fileName, literalTable, variableTable).GetLexemes()
+        root = TreeParser(fileName, lexemes, literalTable, variableTable).GetTree()
+
+        variableTable = [var for var in variableTable if var.itemType != Language.VariableTypes.UNKNOWN]
+        variableView = VariableTableView(variableTable)
+
+        SemanticParser(fileName, root, literalTable, variableView)
+        optimizer = TreeOptimizer(fileName, root, literalTable, variableView)
+
+        Translator(optimizer.GetTree(), literalTable, variableView, print_code=False, file_name=fileName,
+                   vectorize=args.vectorize, memoize=args.memoize, peephole=args.peephole,
+                   code_cache=cache, cache_key=key)
+
+    except LexicalAnalyzerError as ex:
+        print(ex)
+    except ParserError as ex:
+        print(ex)
+    except SemanticError as ex:
+        print(ex)
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Translates the CPP program to Python and runs it.")
+    parser.add_argument("file", nargs="?", default="main.cpp", help="CPP file to translate")
+    parser.add_argument("--memoize", action=argparse.BooleanOptionalAction, default=False,
+                        help="cache the results of the pure functions")
+    parser.add_argument("--vectorize", action=argparse.BooleanOptionalAction, default=False,
+                        help="run simple array cycles as NumPy slice operations")
+    parser.add_argument("--peephole", action=argparse.BooleanOptionalAction, default=True,
+                        help="rewrite the generated Python into cheaper statements")
+    parser.add_argument("--run", action="store_true",
+                        help="only run the program, its compiled code is cached between the runs")
+    parser.add_argument("--cache-dir", default=os.path.join("__pycache__", "translated"),
+                        help="directory of the compiled code cache")
+    args = parser.parse_args()
+
     # Define the testing files name
-    fileName = "main.cpp"
+    fileName = args.file
+
+    if args.run:
+        runProgram(fileName, args)
+        return
 
     # Define tables for the literals and variables
     literalTable = LiteralTable()
@@ -100,12 +163,13 @@ def main():
         lexemes = lexAnalyzer.GetLexemes()
         parser = TreeParser(fileName, lexemes, literalTable, variableTable)
 
+        # Clear variable table and index it for the following passes
+        variableTable = [var for var in variableTable if var.itemType != Language.VariableTypes.UNKNOWN]
+        variableView = VariableTableView(variableTable)
+
         # Check for semantic errors
         root = parser.GetTree()
-        semantic_parser = SemanticParser(fileName, root, literalTable, variableTable)
-
-        # Clear variable table
-        variableTable = [var for var in variableTable if var.itemType != Language.VariableTypes.UNKNOWN]
+        semantic_parser = SemanticParser(fileName, root, literalTable, variableView)
         br()
 
         # Parsed lexemes
@@ -124,10 +188,20 @@ def main():
         print("\t⇒ Syntax tree:\n")
         parser.PrintSyntaxTree()
 
+        # Fold and propagate constants before translation
+        optimizer = TreeOptimizer(fileName, root, literalTable, variableView)
+
         # Translate CPP AST to Python
         br()
         print("\t⇒ Translated code output:\n")
-        translator = Translator(root, literalTable, variableTable)
+        translator = Translator(optimizer.GetTree(), literalTable, variableView, file_name=fileName,
+                                vectorize=args.vectorize, memoize=args.memoize, peephole=args.peephole)
+
+        # Pure functions cache
+        if args.memoize:
+            memo = translator.GetMemoCache()
+            br()
+            print(f"\t⇒ Memoization: {memo.Hits} hits, {memo.Misses} misses\n")
 
     except LexicalAnalyzerError as ex:
         print(ex)
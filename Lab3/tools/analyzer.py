@@ -1,7 +1,13 @@
+import bisect
+
 from core.tables import *
 from core.checks import *
 from core.errors import LexicalAnalyzerError
 
+# Lexeme types whose offset is measured from the beginning of the buffer
+buffered_lexeme_types = frozenset((Language.LexemeTypes.IDENTIFIER, Language.LexemeTypes.STRING,
+                                   Language.LexemeTypes.INT_NUM, Language.LexemeTypes.DOUBLE_NUM))
+
 
 class LexicalAnalyzer:
     """
@@ -24,6 +30,11 @@ class LexicalAnalyzer:
         self.LiteralTable = literal_table
         self.VariableTable = variable_table
 
+        # Positions of the variables in the table by name and block id, in ascending order
+        self.VariableIds = {}
+        for position, variable in enumerate(self.VariableTable):
+            self.VariableIds.setdefault((variable.itemName, variable.itemBlockId), []).append(position)
+
         # Analyzer variables
         self.State = Language.States.START
         self.Char = ''
@@ -94,8 +105,7 @@ class LexicalAnalyzer:
             Define lexeme coordinates and adds it to the list.
         """
 
-        if type in [Language.LexemeTypes.IDENTIFIER, Language.LexemeTypes.STRING,
-                    Language.LexemeTypes.INT_NUM, Language.LexemeTypes.DOUBLE_NUM]:
+        if type in buffered_lexeme_types:
             offset = self.CoordinateOffset - len(self.Buffer)
         else:
             offset = self.CoordinateOffset
@@ -112,22 +122,24 @@ class LexicalAnalyzer:
         block_id = self.Scope[-1][1]
 
         # Find possible existing function arguments with the same name
-        filtered_vars = [var for var in self.VariableTable if
-                         var.itemName == name and var.itemBlockId == 0 and var.itemBlockLevel == 0]
+        filtered_vars = [position for position in self.VariableIds.get((name, 0), [])
+                         if self.VariableTable[position].itemBlockLevel == 0]
         if filtered_vars:
-            last_var = max(filtered_vars, key=lambda x: x.itemId)
-            last_var.itemBlockId = block_id
-            last_var.itemBlockLevel = block_level
+            last_position = filtered_vars[-1]
+            self.VariableIds[(name, 0)].remove(last_position)
+            self.VariableTable[last_position].itemBlockId = block_id
+            self.VariableTable[last_position].itemBlockLevel = block_level
+            bisect.insort(self.VariableIds.setdefault((name, block_id), []), last_position)
 
         # Find if variable already exists in the table
-        for i in range(len(self.VariableTable)):
-            if self.VariableTable[i].itemName == name\
-                    and self.VariableTable[i].itemBlockId == block_id:
-                return i
+        positions = self.VariableIds.get((name, block_id))
+        if positions:
+            return positions[0]
 
         # Add variable to the table
         self.VariableTable.append(VariableTableItem(len(self.VariableTable),
                                                     block_id, block_level, name, Language.VariableTypes.UNKNOWN))
+        self.VariableIds.setdefault((name, block_id), []).append(len(self.VariableTable) - 1)
 
         return len(self.VariableTable) - 1
 
@@ -0,0 +1,121 @@
+import hashlib
+import importlib.util
+import marshal
+import os
+
+# Directories of the modules whose change makes the cached code stale
+tool_directories = ("core", "tools")
+
+
+def GetToolVersion():
+    """
+        Computes the version of the translator: hash of its modules and of the Python bytecode format.
+    """
+
+    version = hashlib.sha256(importlib.util.MAGIC_NUMBER)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    for directory in tool_directories:
+        path = os.path.join(root, directory)
+        for name in sorted(os.listdir(path)):
+            if name.endswith(".py"):
+                version.update(name.encode())
+                with open(os.path.join(path, name), "rb") as file:
+                    version.update(file.read())
+
+    return version.hexdigest()
+
+
+class CodeCache:
+    """
+        Compiled code of the translated programs kept on disk between the runs, the least recently used code is
+        removed when the cache grows over its size limit.
+    """
+
+    def __init__(self, directory, limit=64 << 20):
+        """
+            Initializes the cache stored in the given directory with the limit of its total size in bytes.
+        """
+
+        self.Directory = directory
+        self.Limit = limit
+        self.Version = GetToolVersion()
+
+        # Amount of the programs taken from the cache and compiled
+        self.Hits = 0
+        self.Misses = 0
+
+    def GetKey(self, file_name, options):
+        """
+            Computes the key of the program: hash of its source, the translator version and the translation options.
+        """
+
+        key = hashlib.sha256(self.Version.encode())
+        key.update(repr(sorted(options.items())).encode())
+
+        with open(file_name, "rb") as file:
+            key.update(file.read())
+
+        return key.hexdigest()
+
+    def Get(self, key):
+        """
+            Gets the compiled code stored under the key. Returns None if the cache has no readable code for it.
+        """
+
+        path = os.path.join(self.Directory, key + ".marshal")
+
+        try:
+            with open(path, "rb") as file:
+                code = marshal.load(file)
+        except (OSError, EOFError, ValueError, TypeError):
+            self.Misses += 1
+            return None
+
+        # Used code becomes the most recent one, the read-only cache keeps its order
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.Hits += 1
+
+        return code
+
+    def Push(self, key, code):
+        """
+            Stores the compiled code under the key and removes the least recently used code over the size limit.
+        """
+
+        os.makedirs(self.Directory, exist_ok=True)
+
+        # Code is written under the temporary name first, so the concurrent runs never read a partial file
+        path = os.path.join(self.Directory, key + ".marshal")
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+
+        with open(temporary_path, "wb") as file:
+            marshal.dump(code, file)
+        os.replace(temporary_path, path)
+
+        self.Evict()
+
+    def Evict(self):
+        """
+            Removes the least recently used code while the total size of the cache is over the limit.
+        """
+
+        entries = []
+        for entry in os.scandir(self.Directory):
+            if entry.name.endswith(".marshal"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+
+        for _, size, path in sorted(entries):
+            if total <= self.Limit:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
@@ -0,0 +1,418 @@
+import math
+
+from core.checks import *
+from core.errors import *
+from core.tables import *
+from core.tree import *
+from core.visitor import *
+
+# Control flow statements: variables assigned inside them are not constant after them
+control_key_words = frozenset((Language.KeyWords.IF, Language.KeyWords.WHILE,
+                               Language.KeyWords.DO, Language.KeyWords.FOR))
+
+# Statements leaving the block: code after the control statement containing them may not run
+jump_key_words = frozenset((Language.KeyWords.RETURN, Language.KeyWords.EXIT,
+                            Language.KeyWords.BREAK, Language.KeyWords.CONTINUE))
+
+comparison_operators = {
+    Language.Operators.DOUBLE_EQUAL: lambda a, b: a == b,
+    Language.Operators.NOT_EQUAL: lambda a, b: a != b,
+    Language.Operators.LESS: lambda a, b: a < b,
+    Language.Operators.LESS_EQUAL: lambda a, b: a <= b,
+    Language.Operators.GREATER: lambda a, b: a > b,
+    Language.Operators.GREATER_EQUAL: lambda a, b: a >= b
+}
+
+
+class TreeOptimizer:
+    """
+        Syntax tree optimizer: folds constant expressions and propagates constants through straight-line code.
+    """
+
+    def __init__(self, file_name, tree_root, literal_table, variable_table):
+        """
+            Initializes the optimizer object which simplifies the provided syntax tree in place.
+        """
+
+        # File provided to optimization
+        self.Source = file_name
+        self.Tree = tree_root
+
+        # Constants and variables
+        self.LiteralTable = literal_table
+        self.VariableTable = GetVariableTableView(variable_table)
+
+        # Depth of the statements which may not run: zero divisor is reported only in the code which always runs
+        self.Conditional = 0
+
+        self.Optimize()
+
+    def Optimize(self):
+        """
+            Core function of the optimizer: optimizes every function body with its own constants.
+        """
+
+        if self.Tree is None:
+            return
+
+        for child in self.Tree.GetChildren():
+            if child is not None and child.Type == SyntaxTreNodeTypes.FUNCTION_DECLARATION:
+                self.OptimizeStatement(child.GetChildren()[3], {})
+
+    def GetTree(self):
+        """
+            Returns the optimized syntax tree root.
+        """
+
+        return self.Tree
+
+    def OptimizeStatement(self, node, constants):
+        """
+            Optimizes the statement using and updating the known constants: variable id -> literal lexeme.
+        """
+
+        if node is None:
+            return
+
+        kind = NodeKind(node)
+        children = node.GetChildren()
+
+        if kind == SyntaxTreNodeTypes.CODE_BLOCK:
+            conditional = self.Conditional
+            for child in children:
+                self.OptimizeStatement(child, constants)
+                if child is not None and NodeKind(child) in control_key_words and self.ContainsJump(child):
+                    self.Conditional += 1
+            self.Conditional = conditional
+        elif kind == SyntaxTreNodeTypes.DECLARATION:
+            for child in children[1:]:
+                if child.GetLexeme().itemType == Language.LexemeTypes.IDENTIFIER:
+                    constants.pop(child.GetLexeme().itemValue, None)
+                    self.OptimizeIndexes(child, constants)
+                else:
+                    self.OptimizeAssignment(child, constants)
+        elif kind == Language.Operators.EQUAL:
+            self.OptimizeAssignment(node, constants)
+        elif kind in control_key_words:
+            self.OptimizeControlStatement(node, kind, constants)
+        elif kind in [Language.Operators.INCREMENT, Language.Operators.DECREMENT, Language.KeyWords.CIN]:
+            for child in children:
+                constants.pop(child.GetLexeme().itemValue, None)
+                self.OptimizeIndexes(child, constants)
+        elif kind in [Language.KeyWords.COUT, Language.KeyWords.RETURN, Language.KeyWords.EXIT,
+                      SyntaxTreNodeTypes.FUNCTION_CALL]:
+            self.FoldExpression(node, constants)
+
+    def OptimizeControlStatement(self, node, kind, constants):
+        """
+            Optimizes if / while / do-while / for statement: nested blocks get their own copy of the constants,
+            variables assigned inside the statement are forgotten.
+        """
+
+        children = node.GetChildren()
+
+        # For init is executed once before the cycle
+        if kind == Language.KeyWords.FOR:
+            self.OptimizeStatement(children[0], constants)
+
+        assigned = self.GetAssignedVariables(node)
+        if kind != Language.KeyWords.IF:
+            for variable_id in assigned:
+                constants.pop(variable_id, None)
+
+        # Branches and cycle bodies behind the constant false condition never run and are left as they are
+        if kind == Language.KeyWords.IF:
+            self.FoldExpression(children[0], constants)
+            condition = self.GetConstantCondition(children[0])
+            for position, branch in enumerate(children[1:]):
+                if condition is None:
+                    self.OptimizeConditionalStatement(branch, dict(constants))
+                elif condition == (position == 0):
+                    self.OptimizeStatement(branch, dict(constants))
+        elif kind == Language.KeyWords.WHILE:
+            self.FoldExpression(children[0], constants)
+            if self.GetConstantCondition(children[0]) is not False:
+                for body in children[1:]:
+                    self.OptimizeConditionalStatement(body, dict(constants))
+        elif kind == Language.KeyWords.DO:
+            self.OptimizeStatement(children[0], dict(constants))
+            self.FoldExpression(children[1].GetChildren()[0], constants)
+        elif kind == Language.KeyWords.FOR:
+            if children[1] is not None:
+                self.FoldExpression(children[1], constants)
+            if children[1] is None or self.GetConstantCondition(children[1]) is not False:
+                self.OptimizeConditionalStatement(children[3], dict(constants))
+                self.OptimizeConditionalStatement(children[2], dict(constants))
+
+        for variable_id in assigned:
+            constants.pop(variable_id, None)
+
+    def OptimizeConditionalStatement(self, node, constants):
+        """
+            Optimizes the statement which may not run: branch of the condition or body of the cycle.
+        """
+
+        self.Conditional += 1
+        self.OptimizeStatement(node, constants)
+        self.Conditional -= 1
+
+    def GetConstantCondition(self, node):
+        """
+            Gets the value of the condition folded to a literal. Returns None if the condition is not constant.
+        """
+
+        if not self.IsLiteral(node) or node.GetLexeme().itemType == Language.LexemeTypes.STRING:
+            return None
+
+        return bool(self.GetLiteralValue(node))
+
+    def ContainsJump(self, node):
+        """
+            Checks the statement to contain return, exit, break or continue.
+        """
+
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if current is None:
+                continue
+            if NodeKind(current) in jump_key_words:
+                return True
+            stack.extend(current.GetChildren())
+
+        return False
+
+    def OptimizeAssignment(self, node, constants):
+        """
+            Folds the assigned value and remembers it for the assigned variables if it is a constant.
+        """
+
+        children = node.GetChildren()
+        value = children[len(children) - 1]
+        self.FoldExpression(value, constants)
+
+        for target in children[:-1]:
+            lexeme = target.GetLexeme()
+            if target.Type == SyntaxTreNodeTypes.FUNCTION_CALL or lexeme.itemType != Language.LexemeTypes.IDENTIFIER:
+                continue
+
+            self.OptimizeIndexes(target, constants)
+            if not target.GetChildren() and self.IsLiteral(value) and self.IsTrackedVariable(lexeme.itemValue) \
+                    and value.GetLexeme().itemType in [Language.LexemeTypes.INT_NUM, Language.LexemeTypes.DOUBLE_NUM]:
+                constants[lexeme.itemValue] = value.GetLexeme()
+            else:
+                constants.pop(lexeme.itemValue, None)
+
+    def OptimizeIndexes(self, node, constants):
+        """
+            Folds the array index expressions of the identifier node.
+        """
+
+        for child in node.GetChildren():
+            self.FoldExpression(child, constants)
+
+    def FoldExpression(self, root, constants):
+        """
+            Folds the expression subtree in place walking it in post-order with an explicit stack.
+        """
+
+        stack = [(root, False)]
+        changed = []
+
+        while stack:
+            node, leaving = stack.pop()
+            if node is None:
+                continue
+
+            lexeme = node.GetLexeme()
+            children = node.GetChildren()
+
+            if not leaving:
+                stack.append((node, True))
+
+                # Function name and arguments passed by name are never replaced: argument may be a reference
+                if node.Type == SyntaxTreNodeTypes.FUNCTION_CALL:
+                    for argument in children[1].GetChildren():
+                        if argument.GetLexeme() is not None and not argument.GetChildren() \
+                                and argument.GetLexeme().itemType == Language.LexemeTypes.IDENTIFIER:
+                            changed.append(argument.GetLexeme().itemValue)
+                        else:
+                            stack.append((argument, False))
+                elif lexeme is not None and lexeme.itemType == Language.LexemeTypes.IDENTIFIER:
+                    # Only array indexes are folded in the indexed identifier
+                    for child in children:
+                        stack.append((child, False))
+                else:
+                    for child in children:
+                        stack.append((child, False))
+                continue
+
+            if lexeme is None:
+                continue
+
+            if lexeme.itemType == Language.LexemeTypes.IDENTIFIER:
+                if not children and lexeme.itemValue in constants:
+                    self.ReplaceWithLiteral(node, constants[lexeme.itemValue], lexeme)
+            elif lexeme.itemType == Language.LexemeTypes.OPERATOR and children:
+                self.FoldOperator(node)
+
+        # Variables passed to functions may be changed by them
+        for variable_id in changed:
+            constants.pop(variable_id, None)
+
+    def FoldOperator(self, node):
+        """
+            Replaces the operator node with the literal if all its operands are literals.
+        """
+
+        lexeme = node.GetLexeme()
+        children = node.GetChildren()
+        operator = lexeme.itemValue
+
+        # Divisor folded to 0: the code which may not run keeps the division
+        if operator in [Language.Operators.SLASH, Language.Operators.PERCENT] and len(children) == 2 \
+                and self.IsLiteral(children[1]) and self.GetLiteralValue(children[1]) == 0:
+            if self.Conditional:
+                return
+            divisor = children[1].GetLexeme()
+            raise DivisionByZeroError(self.Source, divisor.coordinate_line, divisor.coordinate_offset)
+
+        if not all(self.IsLiteral(child) for child in children):
+            return
+
+        values = [self.GetLiteralValue(child) for child in children]
+        if any(isinstance(value, str) for value in values):
+            return
+
+        result = None
+        if operator in comparison_operators and len(values) == 2:
+            result = comparison_operators[operator](values[0], values[1])
+        elif operator == Language.Operators.LOGICAL_AND:
+            result = bool(values[0]) and bool(values[1])
+        elif operator == Language.Operators.LOGICAL_OR:
+            result = bool(values[0]) or bool(values[1])
+        elif operator == Language.Operators.NOT:
+            result = not values[0]
+        elif any(isinstance(value, bool) for value in values):
+            return
+        elif operator == Language.Operators.MINUS and len(values) == 1:
+            result = -values[0]
+        elif operator == Language.Operators.PLUS and len(values) == 1:
+            result = values[0]
+        elif operator == Language.Operators.PLUS and len(values) == 2:
+            result = values[0] + values[1]
+        elif operator == Language.Operators.MINUS:
+            result = values[0] - values[1]
+        elif operator == Language.Operators.MULTIPLY:
+            result = values[0] * values[1]
+        elif operator == Language.Operators.SLASH:
+            # Division is folded the way the translated code computes it: true division even for ints
+            result = values[0] / values[1]
+        elif operator == Language.Operators.PERCENT:
+            # Remainder of negative operands differs in CPP and Python
+            if values[0] < 0 or values[1] < 0:
+                return
+            result = values[0] % values[1]
+
+        if result is None or (isinstance(result, float) and not math.isfinite(result)):
+            return
+
+        literal_lexeme = self.CreateLiteralLexeme(result, lexeme)
+        node.Lexeme = literal_lexeme
+        node.Children = NO_CHILDREN
+
+    def CreateLiteralLexeme(self, value, origin):
+        """
+            Creates literal lexeme for the given value placed at the origin lexeme coordinates.
+        """
+
+        if isinstance(value, bool):
+            key_word = Language.KeyWords.TRUE if value else Language.KeyWords.FALSE
+            return LexTableItem(Language.LexemeTypes.KEY_WORD, key_word, origin.coordinate_line, origin.coordinate_offset)
+        elif isinstance(value, int):
+            literal_id = self.LiteralTable.push(str(value), Language.LiteralTypes.INT_CONSTANT)
+            lexeme_type = Language.LexemeTypes.INT_NUM
+        else:
+            literal_id = self.LiteralTable.push(repr(value), Language.LiteralTypes.DOUBLE_CONSTANT)
+            lexeme_type = Language.LexemeTypes.DOUBLE_NUM
+
+        return LexTableItem(lexeme_type, literal_id, origin.coordinate_line, origin.coordinate_offset)
+
+    def ReplaceWithLiteral(self, node, literal, origin):
+        """
+            Replaces the identifier node with the copy of the literal lexeme placed at the identifier coordinates.
+        """
+
+        node.Lexeme = LexTableItem(literal.itemType, literal.itemValue, origin.coordinate_line, origin.coordinate_offset)
+
+    def IsLiteral(self, node):
+        """
+            Checks if the node is a number, string or bool literal.
+        """
+
+        lexeme = node.GetLexeme()
+        if lexeme is None or node.GetChildren():
+            return False
+
+        return lexeme.itemType in literal_types or lexeme.itemValue in [Language.KeyWords.TRUE,
+                                                                         Language.KeyWords.FALSE]
+
+    def GetLiteralValue(self, node):
+        """
+            Gets Python value of the literal node.
+        """
+
+        lexeme = node.GetLexeme()
+
+        if lexeme.itemType == Language.LexemeTypes.INT_NUM:
+            return int(self.LiteralTable.get(lexeme.itemValue).itemValue)
+        elif lexeme.itemType == Language.LexemeTypes.DOUBLE_NUM:
+            return float(self.LiteralTable.get(lexeme.itemValue).itemValue)
+        elif lexeme.itemType == Language.LexemeTypes.STRING:
+            return self.LiteralTable.get(lexeme.itemValue).itemValue
+
+        return lexeme.itemValue == Language.KeyWords.TRUE
+
+    def IsTrackedVariable(self, variable_id):
+        """
+            Checks if the constant value of the variable can be propagated: int or double function local.
+        """
+
+        variable = self.VariableTable.get(variable_id)
+
+        return variable.itemBlockId != 0 and variable.itemType in [Language.VariableTypes.INT,
+                                                                   Language.VariableTypes.DOUBLE]
+
+    def GetAssignedVariables(self, node):
+        """
+            Gets ids of the variables assigned, incremented, read or passed to functions inside the statement.
+        """
+
+        assigned = set()
+        stack = [node]
+
+        while stack:
+            current = stack.pop()
+            if current is None:
+                continue
+
+            kind = NodeKind(current)
+            children = current.GetChildren()
+
+            if kind == Language.Operators.EQUAL:
+                targets = children[:-1]
+            elif kind in [Language.Operators.INCREMENT, Language.Operators.DECREMENT, Language.KeyWords.CIN]:
+                targets = children
+            elif kind == SyntaxTreNodeTypes.FUNCTION_CALL:
+                targets = children[1].GetChildren()
+            else:
+                targets = []
+
+            for target in targets:
+                lexeme = target.GetLexeme()
+                if lexeme is not None and lexeme.itemType == Language.LexemeTypes.IDENTIFIER:
+                    assigned.add(lexeme.itemValue)
+
+            stack.extend(children)
+
+        return assigned
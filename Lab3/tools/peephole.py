@@ -0,0 +1,314 @@
+import ast
+import builtins
+
+# Names of the runtime functions bound in the namespace of the translated module
+runtime_names = frozenset(("__cout__", "__endl__", "__cin__", "__memo__", "__range__", "__max__",
+                           "__numpy__"))
+
+# Operators of the constant expressions folded by the optimizer
+constant_operators = {
+    ast.Add: lambda a, b: a + b,
+    ast.Sub: lambda a, b: a - b,
+    ast.Mult: lambda a, b: a * b,
+    ast.Div: lambda a, b: a / b,
+    ast.FloorDiv: lambda a, b: a // b,
+    ast.Mod: lambda a, b: a % b
+}
+
+# Conversions of the constant numbers folded by the optimizer
+constant_conversions = {
+    "int": int,
+    "float": float
+}
+
+# Operators of the assignments turned into the augmented ones
+augmented_operators = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod,
+                       ast.BitAnd, ast.BitOr, ast.BitXor, ast.LShift, ast.RShift)
+
+
+def GetConstant(node):
+    """
+        Computes the expression made of the number constants and arithmetic operators.
+        Returns None if the expression is not constant or cannot be computed.
+    """
+
+    if isinstance(node, ast.Constant):
+        if type(node.value) in [int, float]:
+            return node.value
+        return None
+
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        operand = GetConstant(node.operand)
+        if operand is None:
+            return None
+        return -operand if isinstance(node.op, ast.USub) else operand
+
+    if isinstance(node, ast.BinOp) and type(node.op) in constant_operators:
+        left = GetConstant(node.left)
+        right = GetConstant(node.right)
+        if left is None or right is None:
+            return None
+        try:
+            return constant_operators[type(node.op)](left, right)
+        except ArithmeticError:
+            return None
+
+    return None
+
+
+def IsPureExpression(node):
+    """
+        Checks the expression to have no calls, so computing it once or twice gives the same.
+    """
+
+    return not any(isinstance(child, (ast.Call, ast.NamedExpr, ast.Await, ast.Yield)) for child in ast.walk(node))
+
+
+def IsJump(statement):
+    """
+        Checks the statement to contain break, continue, return, raise or the exit call.
+    """
+
+    for node in ast.walk(statement):
+        if isinstance(node, (ast.Break, ast.Continue, ast.Return, ast.Raise)):
+            return True
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == "quit":
+            return True
+
+    return False
+
+
+def IsSameTarget(target, value):
+    """
+        Checks the assignment target and the loaded expression to be the same variable or the same array item.
+    """
+
+    if isinstance(target, ast.Name):
+        return isinstance(value, ast.Name) and value.id == target.id
+
+    if isinstance(target, ast.Subscript) and isinstance(value, ast.Subscript):
+        return IsPureExpression(target) and \
+            ast.dump(target.value) == ast.dump(value.value) and ast.dump(target.slice) == ast.dump(value.slice)
+
+    return False
+
+
+class PeepholeOptimizer(ast.NodeTransformer):
+    """
+        Peephole optimizer of the translated Python module: rewrites the generated statements into cheaper ones with
+        the same behaviour.
+    """
+
+    def __init__(self, module):
+        """
+            Initializes the optimizer object which rewrites the provided module in place.
+        """
+
+        self.Module = module
+
+        # Module level names which do not change while the program runs
+        self.Functions = set()
+        self.Modules = set()
+
+        self.Optimize()
+
+    def Optimize(self):
+        """
+            Core function of the optimizer: rewrites the statements, then hoists the global lookups out of the cycles
+            of every function.
+        """
+
+        for node in self.Module.body:
+            if isinstance(node, ast.FunctionDef):
+                self.Functions.add(node.name)
+            elif isinstance(node, ast.Import):
+                self.Modules.update(alias.asname or alias.name for alias in node.names)
+
+        self.Module = self.visit(self.Module)
+
+        for node in self.Module.body:
+            if isinstance(node, ast.FunctionDef):
+                self.HoistGlobals(node)
+
+        ast.fix_missing_locations(self.Module)
+
+    def GetModule(self):
+        """
+            Returns the optimized module.
+        """
+
+        return self.Module
+
+    def visit_FunctionDef(self, node):
+        self.generic_visit(node)
+        node.body = self.OptimizeBlock(node.body)
+        return node
+
+    def visit_For(self, node):
+        self.generic_visit(node)
+        node.body = self.OptimizeBlock(node.body)
+        return node
+
+    def visit_While(self, node):
+        self.generic_visit(node)
+        node.body = self.OptimizeBlock(node.body)
+        return node
+
+    def visit_If(self, node):
+        self.generic_visit(node)
+
+        # Branch of the constant condition replaces the statement
+        test = node.test.value if isinstance(node.test, ast.Constant) else None
+        if isinstance(node.test, ast.Constant) and type(test) in [int, float, bool]:
+            return (node.body if test else node.orelse) or [ast.Pass()]
+
+        node.body = self.OptimizeBlock(node.body)
+        node.orelse = self.OptimizeBlock(node.orelse) if node.orelse else []
+        return node
+
+    def visit_Call(self, node):
+        self.generic_visit(node)
+
+        # int(<constant>) and float(<constant>) become the constant
+        if isinstance(node.func, ast.Name) and node.func.id in constant_conversions \
+                and len(node.args) == 1 and not node.keywords:
+            value = GetConstant(node.args[0])
+            if value is not None:
+                return ast.copy_location(ast.Constant(value=constant_conversions[node.func.id](value)), node)
+
+        return node
+
+    def visit_Assign(self, node):
+        self.generic_visit(node)
+
+        # x = x + y becomes x += y, the array item is indexed once
+        if len(node.targets) == 1 and isinstance(node.value, ast.BinOp) \
+                and isinstance(node.value.op, augmented_operators) and IsSameTarget(node.targets[0], node.value.left):
+            return ast.copy_location(ast.AugAssign(target=node.targets[0], op=node.value.op, value=node.value.right),
+                                     node)
+
+        return node
+
+    def OptimizeBlock(self, statements):
+        """
+            Removes the statements without effect from the list: pass, constant expressions, x = x and the constant
+            assigned to the variable which is assigned again before it is read.
+        """
+
+        optimized = []
+
+        for position, statement in enumerate(statements):
+            if isinstance(statement, ast.Pass):
+                continue
+            if isinstance(statement, ast.Expr) and isinstance(statement.value, ast.Constant):
+                continue
+            if isinstance(statement, ast.Assign) and len(statement.targets) == 1 \
+                    and isinstance(statement.targets[0], ast.Name):
+                name = statement.targets[0].id
+                if isinstance(statement.value, ast.Name) and statement.value.id == name:
+                    continue
+                if isinstance(statement.value, ast.Constant) and self.IsOverwritten(name, statements[position + 1:]):
+                    continue
+            optimized.append(statement)
+
+        return optimized or [ast.Pass()]
+
+    def IsOverwritten(self, name, statements):
+        """
+            Checks the variable to be assigned by one of the statements without being read by it or before it and
+            without a jump before it.
+        """
+
+        for statement in statements:
+            # Jump may leave the block before the assignment, the stored value is seen after it then
+            if IsJump(statement):
+                return False
+
+            reads = any(isinstance(node, ast.Name) and node.id == name for node in ast.walk(statement))
+
+            if isinstance(statement, ast.Assign) and len(statement.targets) == 1 \
+                    and isinstance(statement.targets[0], ast.Name) and statement.targets[0].id == name:
+                return not any(isinstance(node, ast.Name) and node.id == name for node in ast.walk(statement.value))
+            if reads:
+                return False
+
+        return False
+
+    def HoistGlobals(self, function):
+        """
+            Binds the functions, builtins and module attributes loaded in the cycles of the function to local names
+            at its beginning, so the cycles load them as fast locals.
+        """
+
+        local_names = {argument.arg for argument in function.args.args}
+        local_names.update(node.id for node in ast.walk(function)
+                           if isinstance(node, ast.Name) and not isinstance(node.ctx, ast.Load))
+
+        hoisted = {}
+
+        for cycle in ast.walk(function):
+            if not isinstance(cycle, (ast.For, ast.While)):
+                continue
+
+            parts = cycle.body + cycle.orelse + ([cycle.test] if isinstance(cycle, ast.While) else [])
+            for part in parts:
+                for node in ast.walk(part):
+                    key = self.GetGlobalKey(node, local_names)
+                    if key is not None and key not in hoisted:
+                        hoisted[key] = "__local_" + "_".join(name.strip("_") for name in key) + "__"
+
+        if not hoisted:
+            return
+
+        HoistedLoads(hoisted, self, local_names).visit(function)
+
+        bindings = []
+        for key, alias in hoisted.items():
+            value = ast.Name(id=key[0], ctx=ast.Load())
+            if len(key) > 1:
+                value = ast.Attribute(value=value, attr=key[1], ctx=ast.Load())
+            bindings.append(ast.Assign(targets=[ast.Name(id=alias, ctx=ast.Store())], value=value))
+
+        function.body[0:0] = bindings
+
+    def GetGlobalKey(self, node, local_names):
+        """
+            Gets the key of the loaded global name or module attribute which does not change while the program runs:
+            (name,) or (module, attribute). Returns None for the other nodes.
+        """
+
+        if isinstance(node, ast.Attribute) and isinstance(node.ctx, ast.Load) and isinstance(node.value, ast.Name) \
+                and node.value.id in self.Modules and node.value.id not in local_names:
+            return node.value.id, node.attr
+
+        if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load) and node.id not in local_names:
+            if node.id in self.Functions or node.id in runtime_names or node.id in vars(builtins):
+                return node.id,
+
+        return None
+
+
+class HoistedLoads(ast.NodeTransformer):
+    """
+        Replaces the loads of the hoisted globals in the function by their local names.
+    """
+
+    def __init__(self, hoisted, optimizer, local_names):
+        self.Hoisted = hoisted
+        self.Optimizer = optimizer
+        self.LocalNames = local_names
+
+    def visit_Attribute(self, node):
+        key = self.Optimizer.GetGlobalKey(node, self.LocalNames)
+        if key in self.Hoisted:
+            return ast.copy_location(ast.Name(id=self.Hoisted[key], ctx=ast.Load()), node)
+
+        self.generic_visit(node)
+        return node
+
+    def visit_Name(self, node):
+        key = self.Optimizer.GetGlobalKey(node, self.LocalNames)
+        if key in self.Hoisted:
+            return ast.copy_location(ast.Name(id=self.Hoisted[key], ctx=ast.Load()), node)
+
+        return node
@@ -0,0 +1,184 @@
+import functools
+import sys
+
+
+class OutputBuffer:
+    """
+        Output stream of the translated program: cout statements are collected in memory and written to the real
+        stream in large chunks.
+    """
+
+    def __init__(self, stream, limit=1 << 16):
+        """
+            Initializes the buffer over the given stream, the buffer is flushed when it holds limit characters.
+        """
+
+        # Stream the output is flushed to
+        self.Stream = stream
+        self.Limit = limit
+
+        # Collected output and its length
+        self.Parts = []
+        self.Size = 0
+
+        # Interactive output is flushed at every endl and before every input like the CPP stream
+        self.Interactive = stream.isatty()
+
+    def Write(self, text):
+        """
+            Appends the text of one cout statement to the buffer.
+        """
+
+        self.Parts.append(text)
+        self.Size += len(text)
+
+        if self.Size >= self.Limit:
+            self.Flush()
+
+    def WriteLine(self, text):
+        """
+            Appends the text of one cout statement containing endl to the buffer.
+        """
+
+        self.Write(text)
+
+        if self.Interactive:
+            self.Flush()
+
+    def Sync(self):
+        """
+            Flushes the interactive output before the program waits for the input.
+        """
+
+        if self.Interactive:
+            self.Flush()
+
+    def Flush(self):
+        """
+            Writes the collected output to the stream.
+        """
+
+        if self.Parts:
+            self.Stream.write("".join(self.Parts))
+            self.Parts.clear()
+            self.Size = 0
+
+        self.Stream.flush()
+
+
+class InputStream:
+    """
+        Input stream of the translated program: the input is split into whitespace separated tokens which cin
+        statements take one by one and convert to the type of the variable.
+    """
+
+    def __init__(self, stream, tie=None):
+        """
+            Initializes the token stream over the given stream. Output tied to the input is flushed before the program
+            waits for an interactive input.
+        """
+
+        # Binary stream the input is read from
+        self.Stream = getattr(stream, "buffer", stream)
+        self.Tie = tie
+
+        # Redirected input is read at once, interactive one line by line
+        self.Interactive = stream.isatty()
+
+        # Next token of the input
+        self.Next = self.GetTokens().__next__
+
+    def GetTokens(self):
+        """
+            Yields the tokens of the input as bytes.
+        """
+
+        if not self.Interactive:
+            yield from ToBytes(self.Stream.read()).split()
+            return
+
+        while True:
+            if self.Tie is not None:
+                self.Tie.Sync()
+
+            line = ToBytes(self.Stream.readline())
+            if not line:
+                return
+
+            yield from line.split()
+
+
+class MemoCache:
+    """
+        Bounded caches of the results of the pure translated functions with their hit and miss counts.
+    """
+
+    def __init__(self, limit=1 << 16):
+        """
+            Initializes the caches, every function keeps at most limit results.
+        """
+
+        self.Limit = limit
+
+        # Cached functions of all the runs
+        self.Functions = []
+
+    def Wrap(self, function):
+        """
+            Decorates the translated function with its own bounded cache.
+        """
+
+        cached = functools.lru_cache(maxsize=self.Limit)(function)
+        self.Functions.append(cached)
+
+        return cached
+
+    @property
+    def Hits(self):
+        return sum(function.cache_info().hits for function in self.Functions)
+
+    @property
+    def Misses(self):
+        return sum(function.cache_info().misses for function in self.Functions)
+
+
+def ToBytes(data):
+    """
+        Encodes the data read from a text stream, the data of a binary stream is returned as it is.
+    """
+
+    if isinstance(data, str):
+        return data.encode()
+    return data
+
+
+def RunTranslatedCode(code, memo=None):
+    """
+        Executes the compiled module of the translated program in a fresh namespace and calls its main function.
+        The same code object can be run any number of times. The output is flushed when the program ends or exits,
+        the input is read on the first cin. Results of the pure functions are cached in the given memo cache.
+    """
+
+    output = OutputBuffer(sys.stdout)
+    tokens = InputStream(sys.stdin, output)
+
+    if memo is None:
+        memo = MemoCache()
+
+    # Runtime functions called by the translated statements, builtins used by the translator are bound under
+    # reserved names which CPP variables cannot hide
+    namespace = {
+        "__name__": "__translated__",
+        "__cout__": output.Write,
+        "__endl__": output.WriteLine,
+        "__cin__": tokens.Next,
+        "__memo__": memo.Wrap,
+        "__range__": range,
+        "__max__": max
+    }
+
+    try:
+        exec(code, namespace)
+        return namespace["main"]()
+    finally:
+        output.Flush()
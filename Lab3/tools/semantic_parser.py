@@ -1,31 +1,157 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from core.cfg import *
+from core.checks import *
 from core.errors import *
+from core.tables import *
 from core.tree import *
+from core.variable_types import *
+from core.visitor import *
+
+# Kinds of the nodes typed by their own lexeme
+typed_leaf_kinds = (Language.LexemeTypes.IDENTIFIER, Language.LexemeTypes.INT_NUM, Language.LexemeTypes.DOUBLE_NUM,
+                    Language.LexemeTypes.STRING, Language.KeyWords.TRUE, Language.KeyWords.FALSE)
+
+# Kinds of the nodes typed by their children
+typed_operator_kinds = (SyntaxTreNodeTypes.FUNCTION_CALL, Language.Operators.EQUAL, Language.Operators.PLUS,
+                        Language.Operators.MINUS, Language.Operators.MULTIPLY, Language.Operators.SLASH,
+                        Language.Operators.PERCENT) + tuple(bool_operators)
+
+
+class SemanticCache:
+    """
+        Results of the semantic analysis of the functions kept between the runs of the parser on the edited file.
+    """
+
+    def __init__(self):
+        # Function key -> names of the global variables defined by the function
+        self.Functions = {}
+
+        # Amount of the functions taken from the cache and analyzed during the last run
+        self.Hits = 0
+        self.Misses = 0
+
+    def get(self, key):
+        return self.Functions.get(key)
+
+    def push(self, key, defined_globals):
+        self.Functions[key] = defined_globals
 
 
-class SemanticParser:
+# Semantic parser of the worker process used to check function bodies in parallel
+worker_parser = None
+
+
+def InitializeSemanticWorker(file_name, literal_table, variable_table, libraries, namespaces, functions):
+    """
+        Creates the semantic parser of the worker process with the environment collected by the main process.
+    """
+
+    global worker_parser
+
+    worker_parser = SemanticParser(file_name, None, literal_table, variable_table)
+    worker_parser.Environment["Libraries"] = libraries
+    worker_parser.Environment["Namespaces"] = namespaces
+    worker_parser.Environment["Functions"] = functions
+
+
+def CheckFunctionInWorker(function_node, defined_globals):
+    """
+        Checks the function body in the worker process given the ids of the globals defined before the function.
+        Returns the semantic error found or None.
+    """
+
+    variables = bytearray(len(worker_parser.Environment["Variables"]))
+    for variable_id in defined_globals:
+        variables[variable_id] = 1
+    worker_parser.Environment["Variables"] = variables
+    worker_parser.UndefinedUses = set()
+    worker_parser.ExpressionTypes = {}
+
+    try:
+        worker_parser.AnalyzeTree(function_node)
+    except SemanticError as ex:
+        return ex
+
+    return None
+
+
+class SemanticParser(TreePass):
     """
         Python semantic analyzer designed to perform syntax tree analysis.
     """
 
-    def __init__(self, file_name, tree_root, literal_table, variable_table):
+    def __init__(self, file_name, tree_root, literal_table, variable_table, cache=None, workers=None):
         """
             Initializes the semantic parser object which can parse syntax tree and define its problems.
+            Functions which were analyzed without errors in the same context are taken from the provided cache.
+            Given the amount of workers, function bodies are checked in parallel by the process pool.
         """
 
+        super().__init__()
+
         # File provided to analysis
         self.Source = file_name
         self.Tree = tree_root
 
         # Environment, constants and variables
         self.LiteralTable = literal_table
-        self.VariableTable = variable_table
+        self.VariableTable = GetVariableTableView(variable_table)
         self.Environment = {
             "Libraries": [],
             "Namespaces": [],
-            "Functions": {},
-            "Variables": {}
+            # Signatures of the declared functions by their variable ids
+            "Functions": FunctionTable(),
+            # Definedness flags indexed by variable id
+            "Variables": bytearray(max((v.itemId for v in self.VariableTable), default=-1) + 1),
+            # Function locals flags indexed by variable id
+            "LocalVariables": bytearray(max((v.itemId for v in self.VariableTable), default=-1) + 1)
         }
 
+        # Ids of the lexemes using function locals which are not definitely assigned
+        self.UndefinedUses = set()
+
+        # Defined expression types with the lexemes they come from
+        self.ExpressionTypes = {}
+
+        # Results of the previous runs
+        self.Cache = cache
+
+        # Amount of the processes checking function bodies
+        self.Workers = workers
+        self.GlobalIds = None
+
+        # Update parser environment using tree nodes
+        self.OnEnter(Language.KeyWords.INCLUDE, self.UpdateLibraries)
+        self.OnEnter(Language.KeyWords.NAMESPACE, self.UpdateNamespaces)
+        self.OnEnter(Language.Operators.EQUAL, self.UpdateVariables)
+        self.OnEnter(Language.KeyWords.CIN, self.UpdateInputVariables)
+        self.OnEnter(SyntaxTreNodeTypes.FUNCTION_DECLARATION, self.UpdateArguments)
+
+        # Define definitely assigned function locals
+        self.OnEnter(SyntaxTreNodeTypes.FUNCTION_DECLARATION, self.AnalyzeDefiniteAssignment)
+
+        # Check for cout / cin
+        for key_word in [Language.KeyWords.CIN, Language.KeyWords.COUT, Language.KeyWords.ENDL]:
+            self.OnEnter(key_word, self.CheckStreamStatement)
+
+        # Check for using undefined var in assignment and cout
+        self.OnEnter(Language.Operators.EQUAL, self.CheckAssignmentStatement)
+        self.OnEnter(Language.KeyWords.COUT, self.CheckCoutStatement)
+
+        # Define the type of the leaves on entering them, of the operators and calls from their typed children
+        for kind in typed_leaf_kinds:
+            self.OnEnter(kind, self.DefineExpressionType)
+        for kind in typed_operator_kinds:
+            self.OnLeave(kind, self.DefineExpressionType)
+
+        # Check the typed expressions
+        self.OnLeave(Language.Operators.SLASH, self.CheckDivisionStatement)
+        self.OnLeave(Language.Operators.PERCENT, self.CheckPercentageStatement)
+        self.OnLeave(SyntaxTreNodeTypes.FUNCTION_CALL, self.CheckFunctionCallStatement)
+
+        # Signatures are collected before the walk, so calls do not depend on the order of declarations
+        self.UpdateFunctions(self.Tree)
         self.AnalyzeTree(self.Tree)
 
     def AnalyzeTree(self, node):
@@ -33,209 +159,552 @@ class SemanticParser:
             Analyzes the given node and searches for semantic errors.
         """
 
-        # Check if we meet dead-end
-        if node is None:
+        walker = TreeWalker([self])
+
+        if (self.Cache is None and not self.Workers) or node is None:
+            walker.Walk(node)
             return
 
-        # Get lexeme children if there are
+        if self.Cache is not None:
+            self.Cache.Hits = 0
+            self.Cache.Misses = 0
+
+        # Functions left to the process pool: (node, cache key, globals defined before the function, names of the used
+        # globals defined after it)
+        jobs = []
+        error = None
+
+        # Functions are analyzed one by one to skip the ones which did not change
+        for child in node.GetChildren():
+            if child is None or child.Type != SyntaxTreNodeTypes.FUNCTION_DECLARATION:
+                # Errors of the statements after the parallel checked functions are reported after their errors
+                try:
+                    walker.Walk(child)
+                except SemanticError as ex:
+                    if not jobs:
+                        raise
+                    error = ex
+                    break
+                continue
+
+            key, global_ids = self.GetFunctionKey(child) if self.Cache is not None else (None, None)
+            defined_globals = self.Cache.get(key) if self.Cache is not None else None
+
+            if defined_globals is not None:
+                # Replay the effect of the function on the environment
+                self.UpdateArguments(child)
+                for name in defined_globals:
+                    self.Environment["Variables"][global_ids[name]] = 1
+                self.Cache.Hits += 1
+                continue
+
+            if self.Workers:
+                defined_before = self.GetDefinedGlobals()
+                self.UpdateFunctionVariables(child)
+
+                # Globals assigned by the later functions are not defined for this one
+                defined_after = None
+                if self.Cache is not None:
+                    defined_after = [name for name, variable_id in global_ids.items()
+                                     if self.Environment["Variables"][variable_id]]
+
+                jobs.append((child, key, defined_before, defined_after))
+                continue
+
+            walker.Walk(child)
+            self.Cache.Misses += 1
+            self.Cache.push(key, [name for name, variable_id in global_ids.items()
+                                  if self.Environment["Variables"][variable_id]])
+
+        if jobs:
+            self.AnalyzeFunctionsInParallel(jobs)
+
+        if error is not None:
+            raise error
+
+    def AnalyzeFunctionsInParallel(self, jobs):
+        """
+            Checks the function bodies in the process pool and raises the first error in source order.
+        """
+
+        initargs = (self.Source, self.LiteralTable, self.VariableTable, self.Environment["Libraries"],
+                    self.Environment["Namespaces"], self.Environment["Functions"])
+
+        with ProcessPoolExecutor(max_workers=self.Workers, initializer=InitializeSemanticWorker,
+                                 initargs=initargs) as executor:
+            chunk_size = max(1, len(jobs) // (self.Workers * 4))
+            errors = executor.map(CheckFunctionInWorker, [job[0] for job in jobs], [job[2] for job in jobs],
+                                  chunksize=chunk_size)
+
+            for (_, key, _, defined_after), error in zip(jobs, errors):
+                if error is not None:
+                    raise error
+
+                if self.Cache is not None:
+                    self.Cache.Misses += 1
+                    self.Cache.push(key, defined_after)
+
+    def GetDefinedGlobals(self):
+        """
+            Gets the ids of the global variables defined at the moment.
+        """
+
+        if self.GlobalIds is None:
+            self.GlobalIds = [variable.itemId for variable in self.VariableTable if variable.itemBlockId == 0]
+
+        return tuple(variable_id for variable_id in self.GlobalIds if self.Environment["Variables"][variable_id])
+
+    def UpdateFunctionVariables(self, node):
+        """
+            Marks the arguments and the variables assigned anywhere in the function body as defined, the same way
+            the walk over the function does, without checking the function.
+        """
+
+        self.UpdateArguments(node)
+
+        _, defined = self.GetExpressionAccesses(node.GetChildren()[3])
+        for variable_id in defined:
+            self.Environment["Variables"][variable_id] = 1
+
+    def GetFunctionKey(self, node):
+        """
+            Gets the cache key of the function declaration: structural hash of the subtree and of the context it uses,
+            that is signatures of the called functions, types and definedness of the used globals and the environment.
+            Returns the key and the ids of the used globals by their names.
+        """
+
+        tokens = []
+        local_ids = {}
+        global_ids = {}
+        called = {}
+        stack = [node]
+
+        while stack:
+            current = stack.pop()
+            if current is None:
+                tokens.append(None)
+                continue
+
+            lexeme = current.Lexeme
+            children = current.Children
+
+            # Locals are numbered in the order of appearance, so the key does not depend on the ids and names
+            if lexeme is None:
+                token = current.Type
+            elif lexeme.itemType == Language.LexemeTypes.IDENTIFIER:
+                variable = self.GetVariable(lexeme.itemValue)
+                if variable.itemBlockId == 0:
+                    global_ids[variable.itemName] = variable.itemId
+                    token = variable.itemName, variable.itemType
+                else:
+                    token = local_ids.setdefault(variable.itemId, len(local_ids)), variable.itemType
+            elif lexeme.itemType in literal_types:
+                token = lexeme.itemType, self.LiteralTable.get(lexeme.itemValue).itemValue
+            else:
+                token = lexeme.itemValue
+
+            if current.Type == SyntaxTreNodeTypes.FUNCTION_CALL:
+                function = self.Environment["Functions"].get(children[0].Lexeme.itemValue)
+                called[function.itemName] = function.itemType, function.itemArguments
+
+            tokens.append((token, len(children)))
+            stack.extend(reversed(children))
+
+        context = (
+            tuple(sorted(called.items())),
+            tuple(sorted((name, self.Environment["Variables"][variable_id]) for name, variable_id in global_ids.items())),
+            "iostream" in self.Environment["Libraries"],
+            "std" in self.Environment["Namespaces"]
+        )
+
+        # Tuple key is compared as a whole, so equal structural hashes never mix different functions
+        key = tuple(tokens), context
+
+        return key, global_ids
+
+    def UpdateLibraries(self, node):
+        """
+            Adds included library to parser environment.
+        """
+
+        library = self.GetVariable(node.GetChildren()[0].GetLexeme().itemValue)
+        self.Environment["Libraries"].append(library.itemName)
+
+    def UpdateNamespaces(self, node):
+        """
+            Adds used namespace to parser environment.
+        """
+
+        namespace = self.GetVariable(node.GetChildren()[0].GetLexeme().itemValue)
+        self.Environment["Namespaces"].append(namespace.itemName)
+
+    def UpdateVariables(self, node):
+        """
+            Marks variables of the assignment left part as defined.
+        """
+
         children = node.GetChildren()
 
-        # Update parser environment using tree node
-        self.UpdateEnvironment(node)
+        for i in range(len(children) - 1):
+            if children[i].Type == SyntaxTreNodeTypes.FUNCTION_CALL:
+                continue
+            elif children[i].GetLexeme().itemType == Language.LexemeTypes.IDENTIFIER:
+                self.Environment["Variables"][children[i].GetLexeme().itemValue] = 1
 
-        # Define parser behaviour
-        if node.GetLexeme() is not None:
-            lexeme = node.GetLexeme()
+    def UpdateInputVariables(self, node):
+        """
+            Marks variables read by cin as defined.
+        """
 
-            # Check for cout / cin
-            if lexeme.itemValue in [Language.KeyWords.CIN, Language.KeyWords.COUT, Language.KeyWords.ENDL]:
-                if not self.Environment["Libraries"].__contains__("iostream"):
-                    raise SemanticError("iostream library required.", self.Source,
-                                         lexeme.coordinate_line, lexeme.coordinate_offset)
-                if not self.Environment["Namespaces"].__contains__("std"):
-                    raise SemanticError("std namespace required.", self.Source,
-                                         lexeme.coordinate_line, lexeme.coordinate_offset)
+        for child in node.GetChildren():
+            self.Environment["Variables"][child.GetLexeme().itemValue] = 1
 
-            # Check for using undefined var in assignment and cout
-            if lexeme.itemValue == Language.Operators.EQUAL:
+    def UpdateFunctions(self, node):
+        """
+            Adds signatures of the functions declared at the top level of the tree to parser environment.
+        """
+
+        if node is None:
+            return
+
+        for child in node.GetChildren():
+            if child is None or child.Type != SyntaxTreNodeTypes.FUNCTION_DECLARATION:
+                continue
+
+            children = child.GetChildren()
+            function = self.GetVariable(children[1].GetLexeme().itemValue)
+            arguments = tuple(self.GetVariable(arg.GetChildren()[1].GetLexeme().itemValue).itemType
+                              for arg in children[2].GetChildren())
+
+            self.Environment["Functions"].push(FunctionTableItem(function.itemId, function.itemName,
+                                                                 GetItemType(function.itemType),
+                                                                 len(arguments), arguments))
+
+    def UpdateArguments(self, node):
+        """
+            Marks arguments of the declared function as defined.
+        """
+
+        for arg in node.GetChildren()[2].GetChildren():
+            self.Environment["Variables"][arg.GetChildren()[1].GetLexeme().itemValue] = 1
+
+    def AnalyzeDefiniteAssignment(self, node):
+        """
+            Defines uses of the function locals which are not assigned on every path to them.
+            Solves definite assignment over the function control flow graph with bit vectors: bit per local.
+        """
+
+        graph = ControlFlowGraphBuilder(node, self.LiteralTable).GetGraph()
+
+        # Variable id -> bit, arguments are assigned on the function entry
+        bits = {}
+        entry_value = 0
+        for arg in node.GetChildren()[2].GetChildren():
+            variable_id = arg.GetChildren()[1].GetLexeme().itemValue
+            bits[variable_id] = len(bits)
+            entry_value |= 1 << bits[variable_id]
+
+        # Accesses of the statements of every block: (uses, defined ids, declared ids)
+        accesses = [[access for statement in block.Statements for access in self.GetStatementAccesses(statement)]
+                    for block in graph.Blocks]
+        # Arrays and pointers are filled item by item, they are checked by the walk order
+        for block_accesses in accesses:
+            for _, _, declared in block_accesses:
+                for variable_id in declared:
+                    if GetTypeKind(self.GetVariable(variable_id).itemType) not in [Language.VariableTypes.ARRAY,
+                                                                                   Language.VariableTypes.POINTER]:
+                        bits.setdefault(variable_id, len(bits))
+
+        # Assignment generates the bit, declaration without init kills it
+        gen = []
+        kill = []
+        for block_accesses in accesses:
+            block_gen = 0
+            block_kill = 0
+            for _, defined, declared in block_accesses:
+                declared_bits = self.GetBitVector(bits, declared)
+                defined_bits = self.GetBitVector(bits, defined)
+                block_gen = (block_gen & ~declared_bits) | defined_bits
+                block_kill = (block_kill | declared_bits) & ~defined_bits
+            gen.append(block_gen)
+            kill.append(block_kill)
+
+        universe = (1 << len(bits)) - 1
+        block_in, _ = SolveForwardDataflow(graph, gen, kill, entry_value, universe)
+
+        # Find uses which are not definitely assigned
+        for block in graph.Blocks:
+            state = block_in[block.Id]
+            for uses, defined, declared in accesses[block.Id]:
+                for lexeme in uses:
+                    bit = bits.get(lexeme.itemValue)
+                    if bit is not None and not state >> bit & 1:
+                        self.UndefinedUses.add(id(lexeme))
+                state = (state & ~self.GetBitVector(bits, declared)) | self.GetBitVector(bits, defined)
+
+        for variable_id in bits:
+            self.Environment["LocalVariables"][variable_id] = 1
+
+    def GetStatementAccesses(self, node):
+        """
+            Gets checked variable uses, assigned and declared without init variable ids of the statement.
+            Declaration is split into the accesses of every declared variable.
+        """
+
+        if node.Type == SyntaxTreNodeTypes.DECLARATION:
+            accesses = []
+            for child in node.GetChildren()[1:]:
+                if child.GetLexeme().itemType == Language.LexemeTypes.IDENTIFIER:
+                    accesses.append(([], [], [child.GetLexeme().itemValue]))
+                else:
+                    uses, defined = self.GetExpressionAccesses(child)
+                    accesses.append((uses, defined, [child.GetChildren()[0].GetLexeme().itemValue]))
+            return accesses
+
+        uses, defined = self.GetExpressionAccesses(node)
+        return [(uses, defined, [])]
+
+    def GetExpressionAccesses(self, node):
+        """
+            Gets variable uses checked for definedness and assigned variable ids of the statement subtree.
+        """
+
+        uses = []
+        defined = []
+        stack = [node]
+
+        while stack:
+            current = stack.pop()
+            if current is None:
+                continue
+
+            kind = NodeKind(current)
+            children = current.GetChildren()
+
+            if kind == Language.Operators.EQUAL:
                 right_part = children[len(children) - 1].GetLexeme()
                 if right_part and right_part.itemType == Language.LexemeTypes.IDENTIFIER:
-                    self.CheckForDefined(right_part)
-            elif lexeme.itemValue == Language.KeyWords.COUT:
+                    uses.append(right_part)
+                for child in children[:-1]:
+                    if child.Type != SyntaxTreNodeTypes.FUNCTION_CALL \
+                            and child.GetLexeme().itemType == Language.LexemeTypes.IDENTIFIER:
+                        defined.append(child.GetLexeme().itemValue)
+            elif kind == Language.KeyWords.COUT:
                 for child in children:
-                    ch_lexeme = child.GetLexeme()
-                    if ch_lexeme.itemType == Language.LexemeTypes.IDENTIFIER:
-                        self.CheckForDefined(ch_lexeme)
-
-            # Check for 0 in division
-            if lexeme.itemValue == Language.Operators.SLASH:
-                if children[1].GetLexeme().itemType in [Language.LexemeTypes.INT_NUM, Language.LexemeTypes.DOUBLE_NUM]:
-                    self.CheckForNull(children[1])
-
-            # Check for 0 in percentage
-            if lexeme.itemValue == Language.Operators.PERCENT:
-                self.CheckPercentageStatement(children[0])
-                self.CheckPercentageStatement(children[1])
-
-                if children[1].GetLexeme().itemType in [Language.LexemeTypes.INT_NUM, Language.LexemeTypes.DOUBLE_NUM]:
-                    self.CheckForNull(children[1])
-
-        # Check function call
-        elif node.Type == SyntaxTreNodeTypes.FUNCTION_CALL:
-            function_name = self.VariableTable[children[0].GetLexeme().itemValue].itemName
-            arguments_node = children[1].GetChildren()
-
-            # Check valid amount of arguments
-            if len(arguments_node) != len(self.Environment["Functions"][function_name]["Arguments"]):
-                if len(arguments_node) > len(self.Environment["Functions"][function_name]["Arguments"]):
-                    len_err = "many"
-                else:
-                    len_err = "few"
-                raise SemanticError(f"Too {len_err} arguments to function {function_name}", self.Source,
-                                    arguments_node[0].GetLexeme().coordinate_line,
-                                    arguments_node[0].GetLexeme().coordinate_offset)
+                    if child.GetLexeme() is not None and child.GetLexeme().itemType == Language.LexemeTypes.IDENTIFIER:
+                        uses.append(child.GetLexeme())
+            elif kind == Language.KeyWords.CIN:
+                defined.extend(child.GetLexeme().itemValue for child in children)
+            elif kind == SyntaxTreNodeTypes.FUNCTION_CALL:
+                for argument in children[1].GetChildren():
+                    if argument.GetLexeme() is not None \
+                            and argument.GetLexeme().itemType == Language.LexemeTypes.IDENTIFIER:
+                        uses.append(argument.GetLexeme())
 
-            for i in range(len(arguments_node)):
-                # Get function's argument lexeme
-                argument = arguments_node[i].GetLexeme()
+            stack.extend(children)
 
-                if argument.itemType == Language.LexemeTypes.IDENTIFIER:
-                    # Check if argument is defined
-                    self.CheckForDefined(argument)
+        return uses, defined
 
-                # Check if argument has valid type
-                self.CheckArgumentType(function_name, argument, i)
+    def GetBitVector(self, bits, variable_ids):
+        """
+            Builds the bit vector of the provided variables, variables without bits are skipped.
+        """
 
+        vector = 0
+        for variable_id in variable_ids:
+            if variable_id in bits:
+                vector |= 1 << bits[variable_id]
 
+        return vector
 
-        for child in children:
-            self.AnalyzeTree(child)
+    def CheckStreamStatement(self, node):
+        """
+            Checks the environment required by cin, cout and endl.
+        """
+
+        lexeme = node.GetLexeme()
+
+        if "iostream" not in self.Environment["Libraries"]:
+            raise SemanticError("iostream library required.", self.Source,
+                                lexeme.coordinate_line, lexeme.coordinate_offset)
+        if "std" not in self.Environment["Namespaces"]:
+            raise SemanticError("std namespace required.", self.Source,
+                                lexeme.coordinate_line, lexeme.coordinate_offset)
 
-    def UpdateEnvironment(self, node):
+    def CheckAssignmentStatement(self, node):
         """
-            Updates semantic parser environment using info from tree nods.
+            Checks the identifier of the assignment right part to be defined.
         """
 
-        # Get lexeme children if there are
         children = node.GetChildren()
+        right_part = children[len(children) - 1].GetLexeme()
 
-        if node.GetLexeme() is not None:
-            # Add libraries to parser environment
-            if node.GetLexeme().itemValue == Language.KeyWords.INCLUDE:
-                self.Environment["Libraries"].append(self.VariableTable[children[0].GetLexeme().itemValue].itemName)
+        if right_part and right_part.itemType == Language.LexemeTypes.IDENTIFIER:
+            self.CheckForDefined(right_part)
 
-            # Add namespaces to parser environment
-            if node.GetLexeme().itemValue == Language.KeyWords.NAMESPACE:
-                self.Environment["Namespaces"].append(self.VariableTable[children[0].GetLexeme().itemValue].itemName)
+    def CheckCoutStatement(self, node):
+        """
+            Checks the identifiers printed by cout to be defined.
+        """
 
-            if node.GetLexeme().itemValue == Language.Operators.EQUAL:
-                for i in range(len(children)):
-                    if children[i].Type == SyntaxTreNodeTypes.FUNCTION_CALL:
-                        continue
-                    elif children[i].GetLexeme().itemType == Language.LexemeTypes.IDENTIFIER and i != len(children) - 1:
-                        variable = self.GetVariable(children[i].GetLexeme().itemValue)
-                        variable_name = f"{str(variable.itemName)} " \
-                                        f"[{str(variable.itemBlockId)}:{str(variable.itemBlockLevel)}]"
-                        self.Environment["Variables"][variable_name] = "defined"
+        for child in node.GetChildren():
+            ch_lexeme = child.GetLexeme()
+            if ch_lexeme is not None and ch_lexeme.itemType == Language.LexemeTypes.IDENTIFIER:
+                self.CheckForDefined(ch_lexeme)
 
+    def CheckDivisionStatement(self, node):
+        """
+            Checks the divisor for 0.
+        """
 
-        else:
-            # Add functions to parser environment
-            if node.Type == SyntaxTreNodeTypes.FUNCTION_DECLARATION:
-                arguments_node = children[2]
-                arguments = []
-                if arguments_node.GetChildren():
-                    for arg in arguments_node.GetChildren():
-                        variable = self.GetVariable(arg.GetChildren()[1].GetLexeme().itemValue)
-                        arguments.append(variable.itemType)
-
-                        variable_name = f"{str(variable.itemName)} " \
-                                        f"[{str(variable.itemBlockId)}:{str(variable.itemBlockLevel)}]"
-                        self.Environment["Variables"][variable_name] = "defined"
-                function_name = self.GetVariable(children[1].GetLexeme().itemValue).itemName
-                function_info = {
-                    "Type": children[0].GetLexeme().itemValue,
-                    "Arguments": arguments
-                }
-
-                self.Environment["Functions"][function_name] = function_info
+        divisor = node.GetChildren()[1]
+        if divisor.GetLexeme().itemType in [Language.LexemeTypes.INT_NUM, Language.LexemeTypes.DOUBLE_NUM]:
+            self.CheckForNull(divisor)
+
+    def CheckFunctionCallStatement(self, node):
+        """
+            Checks the amount, definedness and types of the function call arguments.
+        """
+
+        children = node.GetChildren()
+        function = self.Environment["Functions"].get(children[0].GetLexeme().itemValue)
+        arguments_node = children[1].GetChildren()
+
+        # Check valid amount of arguments
+        if len(arguments_node) != function.itemArity:
+            len_err = "many" if len(arguments_node) > function.itemArity else "few"
+
+            # Call without arguments is located by the function name
+            lexeme = arguments_node[0].GetLexeme() if arguments_node else children[0].GetLexeme()
+            raise SemanticError(f"Too {len_err} arguments to function {function.itemName}", self.Source,
+                                lexeme.coordinate_line, lexeme.coordinate_offset)
+
+        # Arguments of exactly the required types need no further type checks
+        argument_types = tuple(self.ExpressionTypes.get(argument_node, (None, None))[0]
+                               for argument_node in arguments_node)
+        exact_match = argument_types == function.itemArguments
+
+        for i in range(len(arguments_node)):
+            # Get function's argument lexeme
+            argument = arguments_node[i].GetLexeme()
+
+            if argument is not None and argument.itemType == Language.LexemeTypes.IDENTIFIER:
+                # Check if argument is defined
+                self.CheckForDefined(argument)
+
+            # Check if argument has valid type
+            if not exact_match:
+                self.CheckArgumentType(function, arguments_node[i], i)
+
+    def DefineExpressionType(self, node):
+        """
+            Defines the type of the expression node and the lexeme the type comes from.
+        """
+
+        node_type = self.GetExpressionType(node)
+        if node_type is not None:
+            self.ExpressionTypes[node] = node_type
+
+    def GetExpressionType(self, node):
+        """
+            Gets the type of the expression node from the types of its children.
+        """
+
+        lexeme = node.GetLexeme()
+        children = node.GetChildren()
+
+        # Function call has the return type of the function
+        if lexeme is None:
+            if node.Type == SyntaxTreNodeTypes.FUNCTION_CALL:
+                function_lexeme = children[0].GetLexeme()
+                function_type = self.GetVariable(function_lexeme.itemValue).itemType
+                return function_type.Item, function_lexeme
+            return None
+
+        if lexeme.itemType == Language.LexemeTypes.IDENTIFIER:
+            variable_type = self.GetVariable(lexeme.itemValue).itemType
+
+            # Indexed array or pointer has the type of its items
+            if children:
+                return GetItemType(variable_type), lexeme
+            return variable_type, lexeme
+        elif lexeme.itemType in literal_types:
+            return literal_types[lexeme.itemType], lexeme
+        elif lexeme.itemValue in [Language.KeyWords.TRUE, Language.KeyWords.FALSE]:
+            return Language.VariableTypes.BOOL, lexeme
+        elif lexeme.itemValue in bool_operators:
+            return Language.VariableTypes.BOOL, lexeme
+        elif lexeme.itemValue == Language.Operators.EQUAL:
+            return self.ExpressionTypes.get(children[0])
+        elif IsAdditionOperator(lexeme.itemValue) or IsMultiplicationOperator(lexeme.itemValue):
+            # Arithmetic result is a string, a double or an int depending on the operands
+            operands = [self.ExpressionTypes.get(child) for child in children]
+            for result_type in [Language.VariableTypes.STRING, Language.VariableTypes.DOUBLE]:
+                for operand in operands:
+                    if operand is not None and operand[0] == result_type:
+                        return operand
+            return Language.VariableTypes.INT, lexeme
+
+        return None
 
     def CheckForDefined(self, lexeme):
         """
             Checks if variable initialized.
         """
 
-        variable = self.GetVariable(lexeme.itemValue)
-        variable_name = f"{str(variable.itemName)} " \
-                        f"[{str(variable.itemBlockId)}:{str(variable.itemBlockLevel)}]"
-        if self.Environment["Variables"].get(variable_name) is None:
+        # Function locals are checked by the dataflow results, other variables by the walk order
+        if self.Environment["LocalVariables"][lexeme.itemValue]:
+            defined = id(lexeme) not in self.UndefinedUses
+        else:
+            defined = self.Environment["Variables"][lexeme.itemValue]
+
+        if not defined:
+            variable = self.GetVariable(lexeme.itemValue)
             raise VariableUndefinedError(variable.itemName, self.Source,
                                          lexeme.coordinate_line, lexeme.coordinate_offset)
 
-    def CheckArgumentType(self, function_name, argument, pos):
+    def CheckArgumentType(self, function, argument_node, pos):
         """
             Checks function call statement.
         """
 
-        required_type = self.Environment["Functions"][function_name]["Arguments"][pos]
-        argument_type = None
+        required_type = function.itemArguments[pos]
+        argument_type = self.ExpressionTypes.get(argument_node, (None, None))[0]
+        argument = argument_node.GetLexeme()
 
-        if argument.itemType == Language.LexemeTypes.IDENTIFIER:
-            argument_type = self.GetVariable(argument.itemValue).itemType
-        else:
-            # Parse the literal type.
-            if argument.itemType == Language.LexemeTypes.INT_NUM:
-                argument_type = Language.VariableTypes.INT
-            if argument.itemType == Language.LexemeTypes.DOUBLE_NUM:
-                argument_type = Language.VariableTypes.DOUBLE
-            if argument.itemType == Language.LexemeTypes.STRING:
-                argument_type = Language.VariableTypes.STRING
-            if argument.itemType == Language.LexemeTypes.KEY_WORD and \
-                    argument.itemValue in [Language.KeyWords.TRUE, Language.KeyWords.FALSE]:
-                argument_type = Language.VariableTypes.BOOL
-
-        # Check for the array type
-        if isinstance(argument_type, list) and isinstance(required_type, list):
-            if argument_type[1] != required_type[1]:
-                raise FunctionArgumentError(required_type, argument_type, self.Source,
-                                            argument.coordinate_line, argument.coordinate_offset)
-
-            if argument_type[0] != required_type[0]:
-                if argument_type[0] == Language.VariableTypes.ARRAY \
-                        and required_type[0] == Language.VariableTypes.POINTER:
-                    return
-                else:
-                    raise FunctionArgumentError(required_type, argument_type, self.Source,
-                                                argument.coordinate_line, argument.coordinate_offset)
-        elif (argument_type != required_type) or argument_type is None:
-            if argument.itemType == Language.LexemeTypes.OPERATOR and \
-                required_type in [Language.VariableTypes.BOOL, Language.VariableTypes.INT, Language.VariableTypes.DOUBLE]:
-                return
-            raise FunctionArgumentError(required_type, argument_type, self.Source,
-                                        argument.coordinate_line, argument.coordinate_offset)
+        # Function call argument is located by the function name
+        if argument is None:
+            argument = argument_node.GetChildren()[0].GetLexeme()
+
+        if IsCompatibleType(required_type, argument_type):
+            return
+
+        # Arithmetic and bool expressions are converted to each other
+        if (argument.itemType == Language.LexemeTypes.OPERATOR
+                or argument_node.Type == SyntaxTreNodeTypes.FUNCTION_CALL) \
+                and required_type in convertible_types and argument_type in convertible_types:
+            return
+
+        raise FunctionArgumentError(required_type, argument_type, self.Source,
+                                    argument.coordinate_line, argument.coordinate_offset)
 
     def CheckPercentageStatement(self, node):
         """
-            Checks arithmetic problems in provided syntax tree node.
+            Checks the percentage operands to be ints using their defined types and the divisor for 0.
         """
 
-        if node is None:
-            return
+        children = node.GetChildren()
 
-        # Get current lexeme
-        lexeme = node.GetLexeme()
+        for child in children:
+            node_type = self.ExpressionTypes.get(child)
 
-        if lexeme is not None:
-            if lexeme.itemType == Language.LexemeTypes.DOUBLE_NUM:
-                raise SemanticError("Int was expected in percentage statement.",
-                                    self.Source, lexeme.coordinate_line, lexeme.coordinate_offset)
-            if lexeme.itemType == Language.LexemeTypes.IDENTIFIER \
-                    and self.GetVariable(lexeme.itemValue).itemType == Language.VariableTypes.DOUBLE:
+            if node_type is not None and node_type[0] == Language.VariableTypes.DOUBLE:
+                lexeme = node_type[1]
                 raise SemanticError("Int was expected in percentage statement.",
                                     self.Source, lexeme.coordinate_line, lexeme.coordinate_offset)
 
-        for child in node.GetChildren():
-            self.CheckPercentageStatement(child)
+        if children[1].GetLexeme().itemType in [Language.LexemeTypes.INT_NUM, Language.LexemeTypes.DOUBLE_NUM]:
+            self.CheckForNull(children[1])
 
     def CheckForNull(self, node):
         """
@@ -260,11 +729,7 @@ class SemanticParser:
             Gets variable item from the table.
         """
 
-        variable = None
-
         try:
-            variable = [v for v in self.VariableTable if v.itemId == variable_id][0]
-        except:
+            return self.VariableTable.get(variable_id)
+        except KeyError:
             raise ValueError("Bad variable id")
-
-        return variable
@@ -1,89 +1,360 @@
-import types
+import ast
+import importlib.util
 
 from core.checks import *
+from core.tables import *
 from core.tree import *
+from core.variable_types import *
+from core.visitor import *
+from tools.peephole import *
+from tools.runtime import *
+
+# Python operators of the CPP operators
+binary_operators = {
+    Language.Operators.PLUS: ast.Add,
+    Language.Operators.MINUS: ast.Sub,
+    Language.Operators.MULTIPLY: ast.Mult,
+    Language.Operators.SLASH: ast.Div,
+    Language.Operators.DOUBLE_SLASH: ast.FloorDiv,
+    Language.Operators.PERCENT: ast.Mod,
+    Language.Operators.BITWISE_AND: ast.BitAnd,
+    Language.Operators.BITWISE_OR: ast.BitOr,
+    Language.Operators.BITWISE_XOR: ast.BitXor,
+    Language.Operators.LEFT_SHIFT: ast.LShift,
+    Language.Operators.RIGHT_SHIFT: ast.RShift
+}
+
+unary_operators = {
+    Language.Operators.MINUS: ast.USub,
+    Language.Operators.PLUS: ast.UAdd,
+    Language.Operators.NOT: ast.Not,
+    Language.Operators.BITWISE_NOT: ast.Invert
+}
+
+comparison_operators = {
+    Language.Operators.DOUBLE_EQUAL: ast.Eq,
+    Language.Operators.NOT_EQUAL: ast.NotEq,
+    Language.Operators.LESS: ast.Lt,
+    Language.Operators.LESS_EQUAL: ast.LtE,
+    Language.Operators.GREATER: ast.Gt,
+    Language.Operators.GREATER_EQUAL: ast.GtE
+}
+
+logical_operators = {
+    Language.Operators.LOGICAL_AND: ast.And,
+    Language.Operators.LOGICAL_OR: ast.Or
+}
+
+# Values of the zero initialized array items
+zero_values = {
+    Language.VariableTypes.INT: 0,
+    Language.VariableTypes.DOUBLE: 0.0,
+    Language.VariableTypes.STRING: "",
+    Language.VariableTypes.BOOL: False
+}
+
+# NumPy is optional: without it the array cycles are translated as scalar ones
+numpy_available = importlib.util.find_spec("numpy") is not None
+
+# NumPy types of the items of the arrays run as slices
+numpy_types = {
+    Language.VariableTypes.INT: "int64",
+    Language.VariableTypes.DOUBLE: "float64"
+}
+
+# Operators applied to the NumPy slices item by item
+vector_operators = frozenset((Language.Operators.PLUS, Language.Operators.MINUS, Language.Operators.MULTIPLY))
+
+# Comparisons of the counted cycle: the same comparison with the swapped operands
+range_comparisons = {
+    Language.Operators.LESS: Language.Operators.GREATER,
+    Language.Operators.LESS_EQUAL: Language.Operators.GREATER_EQUAL,
+    Language.Operators.GREATER: Language.Operators.LESS,
+    Language.Operators.GREATER_EQUAL: Language.Operators.LESS_EQUAL
+}
+
+# Operators keeping the expression of int operands int in Python
+int_operators = frozenset((Language.Operators.PLUS, Language.Operators.MINUS,
+                           Language.Operators.MULTIPLY, Language.Operators.PERCENT))
+
+
+class CycleSlicer(ast.NodeTransformer):
+    """
+        Turns the Python expression of one iteration of the cycle into the expression over all its iterations.
+    """
+
+    def __init__(self, get_start, variable_name):
+        """
+            Initializes the transformer with the function building the start expression and the cycle variable name.
+        """
+
+        self.GetStart = get_start
+        self.VariableName = variable_name
+
+    def GetEnd(self):
+        return ast.Name(id=self.VariableName, ctx=ast.Load())
+
+    def visit_Subscript(self, node):
+        node.slice = ast.Slice(lower=self.GetStart(), upper=self.GetEnd(), step=None)
+        return node
+
+    def visit_Name(self, node):
+        if node.id != self.VariableName:
+            return node
 
+        arange = ast.Attribute(value=ast.Name(id="__numpy__", ctx=ast.Load()), attr="arange", ctx=ast.Load())
+        return ast.Call(func=arange, args=[self.GetStart(), self.GetEnd()], keywords=[])
 
-def CreateFunctionObj(name, args, code):
+
+class ContinueLowering(ast.NodeTransformer):
     """
-        Creates a new function object from the given data.
+        Replaces continue of the cycle by the statements run before its next iteration.
     """
 
-    # Build function signature string from arg_types
-    args_str = ", ".join(args)
-    function_str = f"def {name}({args_str}):\n{code}"
+    def __init__(self, get_statements):
+        """
+            Initializes the transformer with the function building the statements replacing one continue.
+        """
 
-    print(function_str)
+        self.GetStatements = get_statements
 
-    # Compile function
-    compiled_func = compile(function_str, "<string>", "exec")
-    func_code = next((c for c in compiled_func.co_consts if isinstance(c, types.CodeType)), None)
+    def visit_For(self, node):
+        return node
 
-    # Creation error handler
-    if func_code is None:
-        raise ValueError("Unable to find function code object.")
+    def visit_While(self, node):
+        return node
+
+    def visit_Continue(self, node):
+        return self.GetStatements()
 
-    return types.FunctionType(func_code, globals(), name)
 
 class Translator:
     """
         CPP to Python translator.
     """
 
-    def __init__(self, tree_root, literal_table, variable_table):
+    def __init__(self, tree_root, literal_table, variable_table, print_code=True, file_name="<translated>",
+                 vectorize=False, memoize=False, peephole=True, code_cache=None, cache_key=None):
         """
             Initializes the translator object which can parse CPP AST and translate it to Python.
+            Translated code is printed before it is run if print_code is set. Line numbers of the translated code
+            point to the lines of the CPP file with the given name. If vectorize is set and NumPy is installed, simple
+            cycles over the local arrays run as NumPy slice operations. If memoize is set, results of the pure
+            functions are cached. If peephole is set, the generated module is rewritten into cheaper statements.
+            Compiled code is stored in the given code cache under the given key.
         """
 
         # Tree provided to translation
         self.Tree = tree_root
+        self.Source = file_name
 
         # Environment, constants and variables
         self.LiteralTable = literal_table
-        self.VariableTable = variable_table
+        self.VariableTable = GetVariableTableView(variable_table)
+
+        # Translated module: Python syntax tree and its compiled code object
+        self.PrintCode = print_code
+        self.Module = None
+        self.Code = None
+
+        # Peephole optimization of the generated module
+        self.Peephole = peephole
+
+        # Cache of the compiled code kept between the runs
+        self.CodeCache = code_cache
+        self.CacheKey = cache_key
+
+        # Cycles of the current function run as NumPy slice operations and the arrays stored in NumPy
+        self.Vectorize = vectorize and numpy_available
+        self.VectorCycles = set()
+        self.VectorArrays = set()
+        self.UsesNumpy = False
+
+        # Pure functions cached when memoization is on, the cache keeps its hits and misses after the run
+        self.Memoize = memoize
+        self.PureFunctions = set()
+        self.Memo = MemoCache()
+
+        # Int variables and int functions which may hold a float in Python
+        self.FloatVariables = set()
+
+        # Instruction parsers dispatched by the node kind
+        self.InstructionHandlers = {
+            SyntaxTreNodeTypes.DECLARATION: self.ParseVariableDeclarationStatement,
+            SyntaxTreNodeTypes.FUNCTION_CALL: self.ParseFunctionCallStatement,
+            SyntaxTreNodeTypes.CODE_BLOCK: self.ParseBlock,
+            Language.Operators.EQUAL: self.ParseAssignmentStatement,
+            Language.KeyWords.IF: self.ParseIfStatement,
+            Language.KeyWords.WHILE: self.ParseWhileStatement,
+            Language.KeyWords.FOR: self.ParseForStatement,
+            Language.KeyWords.DO: self.ParseDoWhileStatement,
+            Language.Operators.INCREMENT: self.ParseUnaryOperatorStatement,
+            Language.Operators.DECREMENT: self.ParseUnaryOperatorStatement,
+            Language.KeyWords.CIN: self.ParseCinStatement,
+            Language.KeyWords.COUT: self.ParseCoutStatement,
+            Language.KeyWords.RETURN: self.ParseReturnExitStatement,
+            Language.KeyWords.EXIT: self.ParseReturnExitStatement,
+            Language.KeyWords.BREAK: self.ParseCycleKeywordStatement,
+            Language.KeyWords.CONTINUE: self.ParseCycleKeywordStatement
+        }
 
         self.Translate()
 
     def Translate(self):
         """
             Core function of the translator: parses the function from AST and translates them to python in order to use.
+            All functions are emitted into one Python syntax tree compiled once and run in its own namespace.
         """
 
         if self.Tree is None:
             return
 
-        children = self.Tree.GetChildren()
+        if self.Memoize:
+            self.PureFunctions = self.FindPureFunctions()
+
+        self.FloatVariables = self.FindFloatVariables()
 
-        for child in children:
+        functions = []
+
+        for child in self.Tree.GetChildren():
             if child.Type == SyntaxTreNodeTypes.FUNCTION_DECLARATION:
-                func_nodes = child.GetChildren()
+                functions.append(self.ParseFunctionDeclaration(child))
 
-                # Get function name
-                func_name = self.GetVariable(func_nodes[1].GetLexeme().itemValue).itemName
+        if self.UsesNumpy:
+            # NumPy is imported under the reserved name, so a CPP variable named numpy does not hide it
+            functions.insert(0, ast.Import(names=[ast.alias(name="numpy", asname="__numpy__")]))
 
-                # Get function arguments
-                func_args = self.GetFunctionArguments(func_nodes[2])
+        self.Module = ast.fix_missing_locations(ast.Module(body=functions, type_ignores=[]))
 
-                # Get function body code
-                body_instructions_nodes = func_nodes[3].GetChildren()
-                instructions = []
+        if self.Peephole:
+            self.Module = PeepholeOptimizer(self.Module).GetModule()
 
-                for instruction_node in body_instructions_nodes:
-                    if not instruction_node:
-                        continue
-                    instruction = self.ParseInstruction(instruction_node, 1)
-                    if instruction is not None:
-                        instructions.append(instruction)
-                func_code = "\n".join(instructions)
+        if self.PrintCode:
+            print(ast.unparse(self.Module))
 
-                # Get function object
-                function_obj = CreateFunctionObj(func_name, func_args, func_code)
+        # Compile the whole program once
+        self.Code = compile(self.Module, self.Source, "exec")
 
-                # Assign function object to global scope
-                globals()[func_name] = function_obj
+        if self.CodeCache is not None:
+            self.CodeCache.Push(self.CacheKey, self.Code)
 
         # Call main function
-        globals()["main"]()
+        RunTranslatedCode(self.Code, self.Memo)
+
+    def GetCode(self):
+        """
+            Returns the compiled code object of the translated program to run it again with RunTranslatedCode.
+        """
+
+        return self.Code
+
+    def GetMemoCache(self):
+        """
+            Returns the cache of the pure functions results with the hit and miss counts of the run.
+        """
+
+        return self.Memo
+
+    def FindPureFunctions(self):
+        """
+            Finds the functions whose result depends only on their arguments: value arguments and result, no input,
+            output or exit, no global variables and calls of the pure functions only.
+        """
+
+        calls = {}
+
+        for child in self.Tree.GetChildren():
+            if child.Type != SyntaxTreNodeTypes.FUNCTION_DECLARATION:
+                continue
+
+            func_nodes = child.GetChildren()
+            function = self.GetVariable(func_nodes[1].GetLexeme().itemValue)
+            function_calls = self.GetPureFunctionCalls(function, func_nodes[2], func_nodes[3])
+
+            if function_calls is not None:
+                calls[function.itemName] = function_calls
+
+        # Functions calling the impure ones are impure too
+        changed = True
+        while changed:
+            changed = False
+            for name, function_calls in list(calls.items()):
+                if not function_calls.issubset(calls):
+                    del calls[name]
+                    changed = True
+
+        return set(calls)
+
+    def GetPureFunctionCalls(self, function, arguments_node, code_node):
+        """
+            Gets the names of the functions called by the function which is pure if they are pure.
+            Returns None if the function is impure itself.
+        """
+
+        if function.itemName == "main" or GetItemType(function.itemType) not in value_types:
+            return None
+
+        for argument in arguments_node.GetChildren():
+            if self.GetVariable(argument.GetChildren()[1].GetLexeme().itemValue).itemType not in value_types:
+                return None
+
+        function_calls = set()
+        stack = [code_node]
+
+        while stack:
+            current = stack.pop()
+            if current is None:
+                continue
+
+            kind = NodeKind(current)
+
+            if kind in [Language.KeyWords.CIN, Language.KeyWords.COUT, Language.KeyWords.EXIT]:
+                return None
+
+            if kind == SyntaxTreNodeTypes.FUNCTION_CALL:
+                callee = current.GetChildren()[0].GetLexeme().itemValue
+                function_calls.add(self.GetVariable(callee).itemName)
+                stack.extend(current.GetChildren()[1:])
+                continue
+
+            # Global variables may be changed between the calls
+            if kind == Language.LexemeTypes.IDENTIFIER and \
+                    self.GetVariable(current.GetLexeme().itemValue).itemBlockId == 0:
+                return None
+
+            stack.extend(current.GetChildren())
+
+        return function_calls
+
+    def ParseFunctionDeclaration(self, declaration_node):
+        """
+            Parses the function declaration to Python function definition.
+        """
+
+        func_nodes = declaration_node.GetChildren()
+
+        # Get function name
+        func_name = self.GetVariable(func_nodes[1].GetLexeme().itemValue).itemName
+
+        # Get function arguments
+        func_args = ast.arguments(posonlyargs=[], args=self.GetFunctionArguments(func_nodes[2]), vararg=None,
+                                  kwonlyargs=[], kw_defaults=[], kwarg=None, defaults=[])
+
+        # Find the cycles run as NumPy slice operations
+        if self.Vectorize:
+            self.FindVectorCycles(func_nodes[3])
+
+        # Get function body code
+        body = self.ParseBlock(func_nodes[3]) or [ast.Pass()]
+
+        # Results of the pure functions are cached by the runtime
+        decorators = []
+        if func_name in self.PureFunctions:
+            decorators.append(ast.Name(id="__memo__", ctx=ast.Load()))
+
+        function = ast.FunctionDef(name=func_name, args=func_args, body=body, decorator_list=decorators, returns=None)
+
+        return self.Locate(function, func_nodes[1])
 
     def GetFunctionArguments(self, node):
         """
@@ -99,20 +370,18 @@ class Translator:
 
             arg_type = None
 
-            if isinstance(variable.itemType, list):
+            if type(variable.itemType) is CompoundType:
                 arg_type = "list"
             else:
                 arg_type = self.GetArgType(variable.itemType)
 
             if arg_type is not None:
-                arg_name = variable.itemName
-                arguments.append(f"{arg_name}: {arg_type}")
+                arguments.append(ast.arg(arg=variable.itemName, annotation=ast.Name(id=arg_type, ctx=ast.Load())))
             else:
                 raise ValueError("Function argument type error")
 
         return arguments
 
-
     def GetArgType(self, arg_type):
         """
             Parses arguments CPP type to Python type.
@@ -132,139 +401,170 @@ class Translator:
             Gets variable item from the table.
         """
 
-        variable = None
-
         try:
-            variable = [v for v in self.VariableTable if v.itemId == variable_id][0]
-        except:
+            return self.VariableTable.get(variable_id)
+        except KeyError:
             raise ValueError("Bad variable id")
 
-        return variable
-
     def GetLiteral(self, literal_id):
         """
             Gets literal item from the table.
         """
 
-        literal = None
-
         try:
-            literal = [v for v in self.LiteralTable.Literals if v.itemId == literal_id][0]
-        except:
-            raise ValueError("Bad variable id")
+            return self.LiteralTable.get(literal_id)
+        except IndexError:
+            raise ValueError("Bad literal id")
+
+    def Locate(self, python_node, node):
+        """
+            Sets the line of the Python node to the line of the first lexeme of the syntax tree node.
+            Nested Python nodes without the location get it from the parent.
+        """
+
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if current is None:
+                continue
+
+            if current.Lexeme is not None:
+                python_node.lineno = python_node.end_lineno = current.Lexeme.coordinate_line
+                python_node.col_offset = python_node.end_col_offset = 0
+                break
+
+            stack.extend(reversed(current.Children))
+
+        return python_node
 
-        return literal
+    def ParseInstruction(self, instruction_node):
+        """
+            Parses given instruction node to the list of Python statements using the handler registered for its kind.
+        """
+
+        handler = self.InstructionHandlers.get(NodeKind(instruction_node))
+
+        if handler is None:
+            return []
+
+        return [self.Locate(statement, instruction_node) for statement in handler(instruction_node)]
 
-    def ParseInstruction(self, instruction_node, level):
+    def ParseBlock(self, block_node):
         """
-            Parses given instruction node.
+            Parses the code block or a single statement to the list of Python statements.
         """
 
-        instruction = None
-        lexeme = None
-        cur_level = '\t' * level
+        if block_node is None:
+            return []
 
-        if instruction_node.Type == SyntaxTreNodeTypes.COMMON:
-            lexeme = instruction_node.GetLexeme()
+        if block_node.Type == SyntaxTreNodeTypes.CODE_BLOCK:
+            nodes = block_node.GetChildren()
+        else:
+            nodes = [block_node]
 
-        if instruction_node.Type == SyntaxTreNodeTypes.DECLARATION:
-            instruction = str(self.ParseVariableDeclarationStatement(instruction_node, level))
-        elif instruction_node.Type == SyntaxTreNodeTypes.FUNCTION_CALL:
-            instruction = str(self.ParseFunctionCallStatement(instruction_node, level))
-        elif lexeme and lexeme.itemValue == Language.Operators.EQUAL:
-            instruction = str(self.ParseOperator(instruction_node, level))
-        elif lexeme and lexeme.itemValue == Language.KeyWords.IF:
-            instruction = str(self.ParseIfStatement(instruction_node, level))
-        elif lexeme and lexeme.itemValue == Language.KeyWords.WHILE:
-            instruction = str(self.ParseWhileStatement(instruction_node, level))
-        elif lexeme and lexeme.itemValue == Language.KeyWords.FOR:
-            instruction = str(self.ParseForStatement(instruction_node, level))
-        elif lexeme and lexeme.itemValue == Language.KeyWords.DO:
-            instruction = str(self.ParseDoWhileStatement(instruction_node, level))
-        elif lexeme and lexeme.itemValue in [Language.Operators.INCREMENT, Language.Operators.DECREMENT]:
-            instruction = str(self.ParseUnaryOperatorStatement(instruction_node, level))
-        elif lexeme and lexeme.itemValue == Language.KeyWords.CIN:
-            instruction = str(self.ParseCinStatement(instruction_node, level))
-        elif lexeme and lexeme.itemValue == Language.KeyWords.COUT:
-            instruction = str(self.ParseCoutStatement(instruction_node, level))
-        elif lexeme and lexeme.itemValue in [Language.KeyWords.RETURN, Language.KeyWords.EXIT]:
-            instruction = str(self.ParseReturnExitStatement(instruction_node, level))
-        elif lexeme and lexeme.itemValue == Language.KeyWords.BREAK:
-            instruction = f"{cur_level}break"
-        elif lexeme and lexeme.itemValue == Language.KeyWords.CONTINUE:
-            instruction = f"{cur_level}continue"
+        statements = []
+        for node in nodes:
+            if node is not None:
+                statements.extend(self.ParseInstruction(node))
 
-        if instruction is not None:
-            return  instruction
+        return statements
 
-    def ParseOperator(self, operator_node, level):
+    def ParseCycleKeywordStatement(self, keyword_node):
         """
-            Parses the operator expression to Python.
+            Parses the break and continue statements to Python.
         """
 
-        parts = []
-        operator = None
-        current_level = level * '\t'
+        if keyword_node.GetLexeme().itemValue == Language.KeyWords.BREAK:
+            return [ast.Break()]
+        elif keyword_node.GetLexeme().itemValue == Language.KeyWords.CONTINUE:
+            return [ast.Continue()]
 
-        if operator_node.GetLexeme().itemType == Language.LexemeTypes.IDENTIFIER:
-            return str(self.GetVariable(operator_node.GetLexeme().itemValue).itemName)
-        elif operator_node.GetLexeme().itemType == Language.LexemeTypes.INT_NUM:
-            return str(self.GetLiteral(operator_node.GetLexeme().itemValue).itemValue)
+    def ParseExpression(self, node):
+        """
+            Parses the expression to Python.
+        """
 
-        try:
-            operator = inverted_operators[operator_node.GetLexeme().itemValue]
-        except:
-            raise ValueError("Unknown operator")
+        if node.Type == SyntaxTreNodeTypes.FUNCTION_CALL:
+            return self.ParseFunctionCall(node)
 
-        if operator == "-" and len(operator_node.GetChildren()) == 1:
-            node = operator_node.GetChildren()[0]
-            lexeme = operator_node.GetChildren()[0].GetLexeme()
+        lexeme = node.GetLexeme()
+        children = node.GetChildren()
 
-            if not node.GetChildren():
-                if lexeme.itemType == Language.LexemeTypes.IDENTIFIER:
-                    return "-" + str(self.GetVariable(lexeme.itemValue).itemName)
-                elif lexeme.itemType in [Language.LexemeTypes.INT_NUM, Language.LexemeTypes.DOUBLE_NUM]:
-                    return "-" + str(self.GetLiteral(lexeme.itemValue).itemValue)
-            elif lexeme.itemType == Language.LexemeTypes.IDENTIFIER:
-                var_name = str(self.GetVariable(lexeme.itemValue).itemName)
-                return "-" + f"{var_name}[int({self.ParseOperator(node.GetChildren()[0], 0)})]"
+        if lexeme is None:
+            raise ValueError("Bad operating part")
+        elif lexeme.itemType == Language.LexemeTypes.IDENTIFIER:
+            return self.ParseVariable(node, ast.Load())
+        elif lexeme.itemType == Language.LexemeTypes.INT_NUM:
+            return ast.Constant(value=int(self.GetLiteral(lexeme.itemValue).itemValue))
+        elif lexeme.itemType == Language.LexemeTypes.DOUBLE_NUM:
+            return ast.Constant(value=float(self.GetLiteral(lexeme.itemValue).itemValue))
+        elif lexeme.itemType == Language.LexemeTypes.STRING:
+            return ast.Constant(value=self.GetLiteral(lexeme.itemValue).itemValue)
+        elif lexeme.itemValue in bool_literals:
+            return ast.Constant(value=lexeme.itemValue == Language.KeyWords.TRUE)
+
+        operator = lexeme.itemValue
+
+        if operator in unary_operators and len(children) == 1:
+            return ast.UnaryOp(op=unary_operators[operator](), operand=self.ParseExpression(children[0]))
+        elif operator in binary_operators:
+            expression = self.ParseExpression(children[0])
+            for child in children[1:]:
+                expression = ast.BinOp(left=expression, op=binary_operators[operator](),
+                                       right=self.ParseExpression(child))
+            return expression
+        elif operator in comparison_operators:
+            return ast.Compare(left=self.ParseExpression(children[0]), ops=[comparison_operators[operator]()],
+                               comparators=[self.ParseExpression(children[1])])
+        elif operator in logical_operators:
+            return ast.BoolOp(op=logical_operators[operator](),
+                              values=[self.ParseExpression(child) for child in children])
+
+        raise ValueError("Unknown operator")
+
+    def ParseVariable(self, variable_node, context):
+        """
+            Parses the variable or the indexed array item to Python.
+        """
 
+        lexeme = variable_node.GetLexeme()
+        name = self.GetVariable(lexeme.itemValue).itemName
 
-        for node in operator_node.GetChildren():
-            lexeme = node.GetLexeme()
-            part = None
+        if not variable_node.GetChildren():
+            return ast.Name(id=name, ctx=context)
 
-            if not node.GetChildren():
-                if lexeme.itemType == Language.LexemeTypes.IDENTIFIER:
-                    part = str(self.GetVariable(lexeme.itemValue).itemName)
-                elif lexeme.itemType in [Language.LexemeTypes.INT_NUM, Language.LexemeTypes.DOUBLE_NUM,
-                                         Language.LexemeTypes.STRING]:
-                    part = str(self.GetLiteral(lexeme.itemValue).itemValue)
-            elif node.Type == SyntaxTreNodeTypes.FUNCTION_CALL:
-                part = self.ParseFunctionCallStatement(node, 0)
-            elif lexeme.itemType == Language.LexemeTypes.IDENTIFIER:
-                var_name = str(self.GetVariable(lexeme.itemValue).itemName)
-                part = f"{var_name}[int({self.ParseOperator(node.GetChildren()[0], 0)})]"
-            elif IsOperator(operator):
-                if lexeme.itemValue == Language.Operators.MINUS and len(node.GetChildren()) == 1:
-                    part = f"{self.ParseOperator(node, 0)}"
-                else:
-                    part = f"({self.ParseOperator(node, 0)})"
+        index = self.ParseIndex(variable_node.GetChildren()[0])
 
-            if part is not None:
-                parts.append(part)
-            else:
-                raise ValueError("Bad operating part")
+        return ast.Subscript(value=ast.Name(id=name, ctx=ast.Load()), slice=index, ctx=context)
 
-        return current_level + str(operator).join(parts)
+    def ParseIndex(self, index_node):
+        """
+            Parses the index or the length of the array to Python. The division gives float in Python and int
+            variables may hold its result, so the expression which is not surely int is converted back to int.
+        """
+
+        index = self.ParseExpression(index_node)
+        if not self.IsIntExpression(index_node):
+            index = ast.Call(func=ast.Name(id="int", ctx=ast.Load()), args=[index], keywords=[])
 
-    def ParseVariableDeclarationStatement(self, declaration_node, level):
+        return index
+
+    def ParseAssignmentStatement(self, assignment_node):
+        """
+            Parses the assignment statement to Python, the chain of assignments gives several targets.
+        """
+
+        children = assignment_node.GetChildren()
+        targets = [self.ParseVariable(child, ast.Store()) for child in children[:-1]]
+
+        return [ast.Assign(targets=targets, value=self.ParseExpression(children[-1]))]
+
+    def ParseVariableDeclarationStatement(self, declaration_node):
         """
             Parses the variable declaration statement to Python.
         """
 
         declarations = []
-        current_level = level * '\t'
 
         for node in declaration_node.GetChildren()[1:]:
             lexeme = node.GetLexeme()
@@ -272,250 +572,820 @@ class Translator:
             declaration = None
             if not node.GetChildren():
                 if lexeme.itemType == Language.LexemeTypes.IDENTIFIER:
-                    variable = str(self.GetVariable(lexeme.itemValue).itemName)
-                    declaration = f"{current_level}{variable}=None"
+                    variable = self.GetVariable(lexeme.itemValue).itemName
+                    declaration = ast.Assign(targets=[ast.Name(id=variable, ctx=ast.Store())],
+                                             value=ast.Constant(value=None))
             elif lexeme.itemType == Language.LexemeTypes.IDENTIFIER:
-                var_name = str(self.GetVariable(lexeme.itemValue).itemName)
-                var_len = self.ParseOperator(node.GetChildren()[0], 0)
-                declaration = f"{current_level}{var_name}=list(None for _ in range({var_len}))"
+                # Arrays are preallocated with the zero value of their items
+                variable = self.GetVariable(lexeme.itemValue)
+                var_len = self.ParseIndex(node.GetChildren()[0])
+                if variable.itemId in self.VectorArrays:
+                    value = self.GetNumpyArray(GetItemType(variable.itemType), var_len)
+                else:
+                    item = ast.Constant(value=zero_values.get(GetItemType(variable.itemType)))
+                    value = ast.BinOp(left=ast.List(elts=[item], ctx=ast.Load()), op=ast.Mult(), right=var_len)
+                declaration = ast.Assign(targets=[ast.Name(id=variable.itemName, ctx=ast.Store())], value=value)
             elif lexeme.itemValue == Language.Operators.EQUAL:
-                declaration = f"{self.ParseOperator(node, level)}"
+                declaration = self.ParseAssignmentStatement(node)[0]
             if declaration is not None:
-                declarations.append(declaration)
+                declarations.append(self.Locate(declaration, node))
             else:
                 raise ValueError("Unknown declaration")
 
-        return "\n".join(declarations)
+        return declarations
 
-    def ParseIfStatement(self, if_node, level):
+    def ParseIfStatement(self, if_node):
         """
             Parses the if statement to Python.
         """
 
-        current_level = level * '\t'
-        condition_node = if_node.GetChildren()[0]
+        children = if_node.GetChildren()
+        condition = self.ParseExpression(children[0])
+        body = self.ParseBlock(children[1]) or [ast.Pass()]
+        orelse = self.ParseBlock(children[2]) if len(children) > 2 else []
 
-        code_node = if_node.GetChildren()[1]
-        instructions = [self.ParseInstruction(instruction, level + 1) for instruction in code_node.GetChildren()]
-        code_block = '\n'.join(instructions)
+        return [ast.If(test=condition, body=body, orelse=orelse)]
 
-        return f"{current_level}if {self.ParseOperator(condition_node, 0)}:\n{code_block}"
+    def ParseFunctionCall(self, call_node):
+        """
+            Parses the function call expression to Python.
+        """
 
-    def ParseFunctionCallStatement(self, call_node, level):
+        function_name = self.GetVariable(call_node.GetChildren()[0].GetLexeme().itemValue).itemName
+        arguments = [self.ParseExpression(arg) for arg in call_node.GetChildren()[1].GetChildren()]
+
+        # Functions are resolved by name in the namespace of the translated module
+        return ast.Call(func=ast.Name(id=function_name, ctx=ast.Load()), args=arguments, keywords=[])
+
+    def ParseFunctionCallStatement(self, call_node):
         """
             Parses the function call statement to Python.
         """
 
-        current_level = level * '\t'
+        return [ast.Expr(value=self.ParseFunctionCall(call_node))]
 
-        function_name = self.GetVariable(call_node.GetChildren()[0].GetLexeme().itemValue).itemName
-        arguments = [self.ParseFunctionArgument(arg)
-                     for arg in call_node.GetChildren()[1].GetChildren()]
-        try:
-            return f"{current_level}globals()['{function_name}']({','.join(arguments)})"
-        except:
-            raise ValueError("Bad function call")
+    def ParseWhileStatement(self, while_node):
+        """
+            Parses the while cycle statement to Python.
+        """
+
+        children = while_node.GetChildren()
+        condition = self.ParseExpression(children[0])
+        body = self.ParseBlock(children[1] if len(children) > 1 else None) or [ast.Pass()]
+
+        return [ast.While(test=condition, body=body, orelse=[])]
 
-    def ParseFunctionArgument(self, argument_node):
+    def ParseForStatement(self, for_node):
         """
-            Gets the name of the function call argument.
+            Parses the for cycle statement to Python: counted cycles become for over range, others become while.
         """
 
-        lexeme = argument_node.GetLexeme()
+        if id(for_node) in self.VectorCycles:
+            return self.ParseVectorForStatement(for_node)
 
-        if not argument_node.GetChildren():
-            if lexeme.itemType == Language.LexemeTypes.IDENTIFIER:
-                return str(self.GetVariable(lexeme.itemValue).itemName)
-            elif lexeme.itemType in [Language.LexemeTypes.INT_NUM, Language.LexemeTypes.DOUBLE_NUM]:
-                return str(self.GetLiteral(lexeme.itemValue).itemValue)
-            elif lexeme.itemType == Language.LexemeTypes.STRING:
-                return repr(self.GetLiteral(lexeme.itemValue).itemValue)
-        elif lexeme.itemType == Language.LexemeTypes.IDENTIFIER:
-            var_name = str(self.GetVariable(lexeme.itemValue).itemName)
-            var_len = self.ParseOperator(argument_node.GetChildren()[0], 0)
-            return f"{var_name}[{var_len}]"
-        elif lexeme.itemType == Language.LexemeTypes.OPERATOR:
-            return self.ParseOperator(argument_node, 0)
+        statements = self.ParseRangeForStatement(for_node)
+        if statements is not None:
+            return statements
+
+        init_node, condition_node, step_node, code_node = for_node.GetChildren()
+        statements = []
+
+        # Cycle init
+        if init_node is not None:
+            statements.extend(self.ParseInstruction(init_node))
+
+        # Cycle body, the variable change is run at its end and before every continue
+        body = self.ParseBlock(code_node)
 
-    def ParseWhileStatement(self, while_node, level):
+        if step_node is not None:
+            body = self.LowerContinue(body, lambda: self.ParseInstruction(step_node) + [ast.Continue()])
+            body.extend(self.ParseInstruction(step_node))
+
+        # Cycle condition is checked by while itself
+        condition = self.ParseExpression(condition_node) if condition_node is not None else ast.Constant(value=True)
+        cycle = ast.While(test=condition, body=body or [ast.Pass()], orelse=[])
+        statements.append(self.Locate(cycle, condition_node) if condition_node is not None else cycle)
+
+        return statements
+
+    def ParseRangeForStatement(self, for_node):
         """
-            Parses the while cycle statement to Python.
+            Parses the counted for cycle to Python for over range. Returns None for the other cycles.
         """
 
-        current_level = level * '\t'
-        condition_node = while_node.GetChildren()[0]
+        cycle = self.GetCountedCycle(for_node)
+        if cycle is None:
+            return None
 
-        code_node = while_node.GetChildren()[1]
-        instructions = [self.ParseInstruction(instruction, level + 1) for instruction in code_node.GetChildren()]
-        code_block = '\n'.join(instructions)
+        variable, start_node, stop, step = cycle
 
-        return f"{current_level}while {self.ParseOperator(condition_node, 0)}:\n{code_block}"
+        arguments = [self.ParseExpression(start_node), stop]
+        if step != 1:
+            arguments.append(ast.Constant(value=step))
 
-    def ParseForStatement(self, for_node, level):
+        # Builtin range is bound under the runtime name, so a CPP variable named range does not hide it
+        cycle_range = ast.Call(func=ast.Name(id="__range__", ctx=ast.Load()), args=arguments, keywords=[])
+        body = self.ParseBlock(for_node.GetChildren()[3]) or [ast.Pass()]
+
+        return [ast.For(target=ast.Name(id=variable.itemName, ctx=ast.Store()), iter=cycle_range, body=body,
+                        orelse=[])]
+
+    def GetCountedCycle(self, for_node):
         """
-            Parses the for cycle statement to Python.
+            Gets the variable, the start node, the Python stop expression and the step of the counted for cycle: the int
+            variable is declared in the init, compared with the bound which does not change in the cycle and changed
+            by the constant step, the body does not change the variable. Returns None for the other cycles.
         """
 
-        current_level = level * '\t'
-        cycle_level = (level + 1) * '\t'
-        condition_nodes = for_node.GetChildren()
+        init_node, condition_node, step_node, code_node = for_node.GetChildren()
+
+        if init_node is None or condition_node is None or step_node is None:
+            return None
 
-        code_node = condition_nodes[len(for_node.GetChildren()) - 1]
-        instructions = [self.ParseInstruction(instruction, level + 1) for instruction in code_node.GetChildren()]
-        code_block = '\n'.join(instructions)
+        # Cycle variable declared with the init: for (int i = start; ...)
+        if init_node.Type != SyntaxTreNodeTypes.DECLARATION or len(init_node.GetChildren()) != 2:
+            return None
 
-        if len(condition_nodes) == 1 and condition_nodes[0].Type == SyntaxTreNodeTypes.CODE_BLOCK:
-            return f"{current_level}while 1:\n{code_block}"
-        elif len(condition_nodes) == 4:
-            first_condition = None
-            if condition_nodes[0].Type == SyntaxTreNodeTypes.DECLARATION:
-                first_condition = self.ParseVariableDeclarationStatement(condition_nodes[0], level)
-            elif condition_nodes[0].GetLexeme().itemType == Language.LexemeTypes.OPERATOR:
-                first_condition = self.ParseOperator(condition_nodes[0], level)
-            second_condition = self.ParseOperator(condition_nodes[1], 0)
-            third_condition = self.ParseInstruction(condition_nodes[2], level)
+        assignment_node = init_node.GetChildren()[1]
+        if NodeKind(assignment_node) != Language.Operators.EQUAL or len(assignment_node.GetChildren()) != 2:
+            return None
 
-            return f"{first_condition}\n" \
-                   f"{current_level}while 1:\n" \
-                   f"{cycle_level}if not {second_condition}: break\n" \
-                   f"{code_block}\n" \
-                   f"{current_level}{third_condition}"
+        variable_node, start_node = assignment_node.GetChildren()
+        variable = self.GetVariable(variable_node.GetLexeme().itemValue)
+        if variable_node.GetChildren() or variable.itemType != Language.VariableTypes.INT:
+            return None
 
+        step = self.GetRangeStep(step_node, variable.itemId)
+        if step is None:
+            return None
 
+        # Cycle condition: i < bound, i <= bound, i > bound, i >= bound or the same with swapped operands
+        operator = NodeKind(condition_node)
+        if operator not in range_comparisons:
+            return None
+
+        left_node, right_node = condition_node.GetChildren()
+        if self.IsSimpleVariable(left_node, variable.itemId):
+            bound_node = right_node
+        elif self.IsSimpleVariable(right_node, variable.itemId):
+            bound_node = left_node
+            operator = range_comparisons[operator]
+        else:
+            return None
+
+        # Cycle must move towards the bound
+        if (step > 0) != (operator in [Language.Operators.LESS, Language.Operators.LESS_EQUAL]):
+            return None
+
+        start_variables = self.GetIntExpressionVariables(start_node)
+        bound_variables = self.GetIntExpressionVariables(bound_node)
+        if start_variables is None or bound_variables is None:
+            return None
+
+        # Neither the variable nor the bound may change in the body
+        written, has_calls = self.GetWrittenVariables(code_node)
+        if variable.itemName in written:
+            return None
+        for bound_variable in bound_variables:
+            if bound_variable.itemId == variable.itemId or bound_variable.itemName in written:
+                return None
+            if has_calls and bound_variable.itemBlockId == 0:
+                return None
+
+        stop = self.ParseExpression(bound_node)
+        if operator == Language.Operators.LESS_EQUAL:
+            stop = ast.BinOp(left=stop, op=ast.Add(), right=ast.Constant(value=1))
+        elif operator == Language.Operators.GREATER_EQUAL:
+            stop = ast.BinOp(left=stop, op=ast.Sub(), right=ast.Constant(value=1))
+
+        return variable, start_node, stop, step
+
+    def GetRangeStep(self, step_node, variable_id):
+        """
+            Gets the constant step of the cycle variable change: i++, i--, i = i + c, i = c + i or i = i - c.
+            Returns None for the other changes.
+        """
+
+        kind = NodeKind(step_node)
+        children = step_node.GetChildren()
+
+        if kind in [Language.Operators.INCREMENT, Language.Operators.DECREMENT]:
+            if not self.IsSimpleVariable(children[0], variable_id):
+                return None
+            return 1 if kind == Language.Operators.INCREMENT else -1
+
+        if kind != Language.Operators.EQUAL or len(children) != 2 or \
+                not self.IsSimpleVariable(children[0], variable_id):
+            return None
+
+        change_node = children[1]
+        change_kind = NodeKind(change_node)
+        if change_kind not in [Language.Operators.PLUS, Language.Operators.MINUS] or \
+                len(change_node.GetChildren()) != 2:
+            return None
+
+        left_node, right_node = change_node.GetChildren()
+        if self.IsSimpleVariable(left_node, variable_id):
+            step_node = right_node
+        elif change_kind == Language.Operators.PLUS and self.IsSimpleVariable(right_node, variable_id):
+            step_node = left_node
+        else:
+            return None
 
-        # return f"{current_level}while {self.ParseOperator(condition_node, 0)}:\n{code_block}"
+        if NodeKind(step_node) != Language.LexemeTypes.INT_NUM:
+            return None
 
-    def ParseDoWhileStatement(self, doWhile_node, level):
+        step = int(self.GetLiteral(step_node.GetLexeme().itemValue).itemValue)
+        if change_kind == Language.Operators.MINUS:
+            step = -step
+
+        return step if step != 0 else None
+
+    def IsSimpleVariable(self, node, variable_id):
+        """
+            Checks the node to be the given variable without index.
+        """
+
+        lexeme = node.GetLexeme()
+
+        return lexeme is not None and lexeme.itemType == Language.LexemeTypes.IDENTIFIER \
+            and lexeme.itemValue == variable_id and not node.GetChildren()
+
+    def GetIntExpressionVariables(self, node):
+        """
+            Gets the variables of the expression made of int literals, int variables and operators keeping ints.
+            Returns None if the expression may be not int.
+        """
+
+        variables = []
+        stack = [node]
+
+        while stack:
+            current = stack.pop()
+            kind = NodeKind(current)
+
+            if kind == Language.LexemeTypes.IDENTIFIER:
+                variable = self.GetVariable(current.GetLexeme().itemValue)
+                if current.GetChildren() or variable.itemType != Language.VariableTypes.INT \
+                        or variable.itemId in self.FloatVariables:
+                    return None
+                variables.append(variable)
+            elif kind in int_operators:
+                stack.extend(current.GetChildren())
+            elif kind != Language.LexemeTypes.INT_NUM:
+                return None
+
+        return variables
+
+    def IsIntExpression(self, node, int_arrays=frozenset()):
+        """
+            Checks the expression to give int in Python: int literals, int variables and calls of the int functions
+            which never hold a float, items of the given int arrays, operators keeping ints.
+        """
+
+        stack = [node]
+
+        while stack:
+            current = stack.pop()
+            kind = NodeKind(current)
+
+            if kind == Language.LexemeTypes.IDENTIFIER:
+                variable = self.GetVariable(current.GetLexeme().itemValue)
+                if current.GetChildren():
+                    if variable.itemId not in int_arrays:
+                        return False
+                elif variable.itemType != Language.VariableTypes.INT or variable.itemId in self.FloatVariables:
+                    return False
+            elif kind == SyntaxTreNodeTypes.FUNCTION_CALL:
+                function = self.GetVariable(current.GetChildren()[0].GetLexeme().itemValue)
+                if GetItemType(function.itemType) != Language.VariableTypes.INT \
+                        or function.itemId in self.FloatVariables:
+                    return False
+            elif kind in int_operators:
+                stack.extend(current.GetChildren())
+            elif kind != Language.LexemeTypes.INT_NUM:
+                return False
+
+        return True
+
+    def FindFloatVariables(self):
+        """
+            Finds the int variables and int functions which may hold a float in Python: the division gives float, so
+            the variable, the argument or the result assigned an expression which is not surely int may be float.
+            Such variables make the expressions with them not int in turn, so they are searched until no new one
+            appears.
+        """
+
+        # Variables of the arguments of every function
+        arguments = {}
+        for child in self.Tree.GetChildren():
+            if child.Type == SyntaxTreNodeTypes.FUNCTION_DECLARATION:
+                func_nodes = child.GetChildren()
+                function = self.GetVariable(func_nodes[1].GetLexeme().itemValue)
+                arguments[function.itemId] = [self.GetVariable(argument.GetChildren()[1].GetLexeme().itemValue)
+                                              for argument in func_nodes[2].GetChildren()]
+
+        # Assigned variables with their values: assignments, arguments of the calls and results of the functions
+        assignments = []
+        for child in self.Tree.GetChildren():
+            function = None
+            stack = [child]
+            if child.Type == SyntaxTreNodeTypes.FUNCTION_DECLARATION:
+                function = self.GetVariable(child.GetChildren()[1].GetLexeme().itemValue)
+                stack = [child.GetChildren()[3]]
+
+            while stack:
+                current = stack.pop()
+                if current is None:
+                    continue
+
+                kind = NodeKind(current)
+                children = current.GetChildren()
+
+                if kind == Language.Operators.EQUAL:
+                    for target in children[:-1]:
+                        if NodeKind(target) == Language.LexemeTypes.IDENTIFIER and not target.GetChildren():
+                            assignments.append((self.GetVariable(target.GetLexeme().itemValue), children[-1]))
+                elif kind == SyntaxTreNodeTypes.FUNCTION_CALL:
+                    callee = self.GetVariable(children[0].GetLexeme().itemValue)
+                    assignments.extend(zip(arguments.get(callee.itemId, []), children[1].GetChildren()))
+                elif kind == Language.KeyWords.RETURN and children and function is not None:
+                    assignments.append((function, children[0]))
+
+                stack.extend(children)
+
+        float_variables = set()
+        self.FloatVariables = float_variables
+
+        changed = True
+        while changed:
+            changed = False
+            for variable, value in assignments:
+                if variable.itemId not in float_variables and not self.IsIntExpression(value):
+                    float_variables.add(variable.itemId)
+                    changed = True
+
+        return float_variables
+
+    def GetWrittenVariables(self, node):
+        """
+            Gets the names of the variables assigned, changed or read by cin in the statement and whether it calls
+            functions.
+        """
+
+        written = set()
+        has_calls = False
+        stack = [node]
+
+        while stack:
+            current = stack.pop()
+            if current is None:
+                continue
+
+            kind = NodeKind(current)
+            children = current.GetChildren()
+
+            if kind == Language.Operators.EQUAL:
+                targets = children[:-1]
+            elif kind in [Language.Operators.INCREMENT, Language.Operators.DECREMENT, Language.KeyWords.CIN]:
+                targets = children
+            else:
+                targets = []
+                has_calls = has_calls or kind == SyntaxTreNodeTypes.FUNCTION_CALL
+
+            for target in targets:
+                if target.GetLexeme() is not None and target.GetLexeme().itemType == Language.LexemeTypes.IDENTIFIER:
+                    written.add(self.GetVariable(target.GetLexeme().itemValue).itemName)
+
+            stack.extend(children)
+
+        return written, has_calls
+
+    def FindVectorCycles(self, code_node):
+        """
+            Finds the cycles of the function body which can run as NumPy slice operations and the arrays they use.
+            Only the arrays declared in the function are taken, so no other name can refer to them.
+        """
+
+        self.VectorCycles = set()
+        self.VectorArrays = set()
+
+        local_arrays = set()
+        cycles = []
+        stack = [code_node]
+
+        while stack:
+            current = stack.pop()
+            if current is None:
+                continue
+
+            if current.Type == SyntaxTreNodeTypes.DECLARATION:
+                for node in current.GetChildren()[1:]:
+                    lexeme = node.GetLexeme()
+                    if node.GetChildren() and lexeme.itemType == Language.LexemeTypes.IDENTIFIER:
+                        local_arrays.add(self.GetVariable(lexeme.itemValue).itemId)
+            elif NodeKind(current) == Language.KeyWords.FOR:
+                cycles.append(current)
+
+            stack.extend(current.GetChildren())
+
+        # NumPy int array truncates the stored floats, so every store to it must be int
+        int_arrays = self.FindIntArrays(code_node, local_arrays)
+
+        for for_node in cycles:
+            arrays = self.GetVectorCycleArrays(for_node, local_arrays)
+            if arrays is None:
+                continue
+            if any(GetItemType(self.GetVariable(array).itemType) == Language.VariableTypes.INT
+                   and array not in int_arrays for array in arrays):
+                continue
+
+            self.VectorCycles.add(id(for_node))
+            self.VectorArrays.update(arrays)
+
+    def FindIntArrays(self, code_node, local_arrays):
+        """
+            Finds the local int arrays every store to which is int. Stored expressions may read the items of such
+            arrays, so the arrays are dropped until no store changes. Arrays passed to the functions are not taken.
+        """
+
+        stores = []
+        passed = set()
+        stack = [code_node]
+
+        while stack:
+            current = stack.pop()
+            if current is None:
+                continue
+
+            kind = NodeKind(current)
+            children = current.GetChildren()
+
+            if kind == Language.Operators.EQUAL:
+                for target in children[:-1]:
+                    if NodeKind(target) == Language.LexemeTypes.IDENTIFIER and target.GetChildren():
+                        stores.append((self.GetVariable(target.GetLexeme().itemValue).itemId, children[-1]))
+            elif kind == SyntaxTreNodeTypes.FUNCTION_CALL:
+                for argument in children[1].GetChildren():
+                    if NodeKind(argument) == Language.LexemeTypes.IDENTIFIER and not argument.GetChildren():
+                        passed.add(self.GetVariable(argument.GetLexeme().itemValue).itemId)
+
+            stack.extend(children)
+
+        int_arrays = {array for array in local_arrays if array not in passed
+                      and GetItemType(self.GetVariable(array).itemType) == Language.VariableTypes.INT}
+
+        changed = True
+        while changed:
+            changed = False
+            for array, value in stores:
+                if array in int_arrays and not self.IsIntExpression(value, int_arrays):
+                    int_arrays.discard(array)
+                    changed = True
+
+        return int_arrays
+
+    def GetVectorCycleArrays(self, for_node, local_arrays):
+        """
+            Gets the arrays of the counted cycle with the step 1 whose body is made of the item by item assignments
+            b[i] = expression and the reductions s = s + expression. All arrays are indexed by the cycle variable, so
+            every iteration touches only its own items and the statements can run one after another over the whole
+            slices. Returns None for the other cycles.
+        """
+
+        cycle = self.GetCountedCycle(for_node)
+        if cycle is None:
+            return None
+
+        variable, start_node, stop, step = cycle
+        code_node = for_node.GetChildren()[3]
+        if step != 1 or code_node is None:
+            return None
+
+        # Scalars and the start of the slices may not change in the cycle
+        written, has_calls = self.GetWrittenVariables(code_node)
+        if has_calls or any(start_variable.itemName in written
+                            for start_variable in self.GetIntExpressionVariables(start_node)):
+            return None
+
+        if code_node.Type == SyntaxTreNodeTypes.CODE_BLOCK:
+            statements = code_node.GetChildren()
+        else:
+            statements = [code_node]
+
+        arrays = set()
+
+        for statement in statements:
+            if NodeKind(statement) != Language.Operators.EQUAL or len(statement.GetChildren()) != 2:
+                return None
+
+            target_node, value_node = statement.GetChildren()
+            target = self.GetVariable(target_node.GetLexeme().itemValue)
+
+            if target_node.GetChildren():
+                item_type = self.GetVectorItemType(target_node, variable, local_arrays)
+                if item_type is None or \
+                        not self.IsVectorExpression(value_node, item_type, variable, written, local_arrays, arrays):
+                    return None
+                arrays.add(target.itemId)
+                continue
+
+            # Reduction must read at least one array, its scalar is not read by the other statements
+            reduction = self.GetReduction(value_node, target.itemId)
+            if reduction is None or target.itemType not in numpy_types:
+                return None
+
+            reduced_arrays = set()
+            for operand in reduction[1]:
+                if not self.IsVectorExpression(operand, target.itemType, variable, written, local_arrays,
+                                               reduced_arrays):
+                    return None
+            if not reduced_arrays:
+                return None
+            arrays.update(reduced_arrays)
+
+        return arrays
+
+    def GetVectorItemType(self, array_node, variable, local_arrays):
+        """
+            Gets the item type of the local int or double array indexed by the cycle variable, None for the other
+            variables.
+        """
+
+        array = self.GetVariable(array_node.GetLexeme().itemValue)
+
+        if array.itemId not in local_arrays or GetTypeKind(array.itemType) != Language.VariableTypes.ARRAY:
+            return None
+        if not self.IsSimpleVariable(array_node.GetChildren()[0], variable.itemId):
+            return None
+
+        item_type = GetItemType(array.itemType)
+        return item_type if item_type in numpy_types else None
+
+    def IsVectorExpression(self, node, item_type, variable, written, local_arrays, arrays):
+        """
+            Checks the expression to be computed item by item over the slices: arrays indexed by the cycle variable,
+            the cycle variable, scalars not changed in the cycle and literals joined by +, - and *. The int expression has only int
+            operands. Arrays of the expression are added to the given set.
+        """
+
+        stack = [node]
+
+        while stack:
+            current = stack.pop()
+            kind = NodeKind(current)
+
+            if kind == Language.LexemeTypes.IDENTIFIER:
+                operand = self.GetVariable(current.GetLexeme().itemValue)
+
+                if current.GetChildren():
+                    operand_type = self.GetVectorItemType(current, variable, local_arrays)
+                    if operand_type is None:
+                        return False
+                    arrays.add(operand.itemId)
+                elif operand.itemId == variable.itemId:
+                    # Cycle variable becomes the NumPy range
+                    operand_type = Language.VariableTypes.INT
+                else:
+                    if operand.itemName in written:
+                        return False
+                    operand_type = operand.itemType
+
+                if operand_type != Language.VariableTypes.INT and \
+                        (operand_type != Language.VariableTypes.DOUBLE or item_type != Language.VariableTypes.DOUBLE):
+                    return False
+            elif kind in vector_operators:
+                stack.extend(current.GetChildren())
+            elif kind != Language.LexemeTypes.INT_NUM and \
+                    (kind != Language.LexemeTypes.DOUBLE_NUM or item_type != Language.VariableTypes.DOUBLE):
+                return False
+
+        return True
+
+    def GetReduction(self, value_node, target_id):
+        """
+            Gets the operator and the added operands of the reduction s = s + a + ... or s = s - a.
+            Returns None for the other expressions.
+        """
+
+        kind = NodeKind(value_node)
+        children = value_node.GetChildren()
+
+        if kind == Language.Operators.PLUS:
+            own = [child for child in children if self.IsSimpleVariable(child, target_id)]
+            if len(own) != 1:
+                return None
+            return ast.Add, [child for child in children if child is not own[0]]
+
+        if kind == Language.Operators.MINUS and len(children) == 2 and self.IsSimpleVariable(children[0], target_id):
+            return ast.Sub, [children[1]]
+
+        return None
+
+    def ParseVectorForStatement(self, for_node):
+        """
+            Parses the cycle found by FindVectorCycles to NumPy slice operations. The cycle variable gets its value
+            after the cycle first and the slices end at it.
+        """
+
+        variable, start_node, stop, _ = self.GetCountedCycle(for_node)
+        code_node = for_node.GetChildren()[3]
+
+        # Builtin max is bound under the runtime name, so a CPP variable named max does not hide it
+        end = ast.Call(func=ast.Name(id="__max__", ctx=ast.Load()), args=[self.ParseExpression(start_node), stop],
+                       keywords=[])
+        statements = [ast.Assign(targets=[ast.Name(id=variable.itemName, ctx=ast.Store())], value=end)]
+
+        if code_node.Type == SyntaxTreNodeTypes.CODE_BLOCK:
+            nodes = code_node.GetChildren()
+        else:
+            nodes = [code_node]
+
+        for node in nodes:
+            target_node, value_node = node.GetChildren()
+
+            if target_node.GetChildren():
+                target = self.SliceArrays(self.ParseVariable(target_node, ast.Store()), start_node, variable)
+                value = self.SliceArrays(self.ParseExpression(value_node), start_node, variable)
+                statements.append(self.Locate(ast.Assign(targets=[target], value=value), node))
+                continue
+
+            target = self.GetVariable(target_node.GetLexeme().itemValue)
+            operator, operands = self.GetReduction(value_node, target.itemId)
+
+            total = self.SliceArrays(self.ParseExpression(operands[0]), start_node, variable)
+            for operand in operands[1:]:
+                total = ast.BinOp(left=total, op=ast.Add(),
+                                  right=self.SliceArrays(self.ParseExpression(operand), start_node, variable))
+
+            # The sum is converted back from the NumPy scalar
+            total = ast.Call(func=ast.Attribute(value=total, attr="sum", ctx=ast.Load()), args=[], keywords=[])
+            total = ast.Call(func=ast.Name(id=self.GetArgType(target.itemType), ctx=ast.Load()), args=[total],
+                             keywords=[])
+            value = ast.BinOp(left=ast.Name(id=target.itemName, ctx=ast.Load()), op=operator(), right=total)
+            statements.append(self.Locate(ast.Assign(targets=[ast.Name(id=target.itemName, ctx=ast.Store())],
+                                                     value=value), node))
+
+        return statements
+
+    def SliceArrays(self, expression, start_node, variable):
+        """
+            Replaces the items indexed by the cycle variable in the Python expression by the slices of the cycle and
+            the cycle variable itself by the NumPy range of its values.
+        """
+
+        return CycleSlicer(lambda: self.ParseExpression(start_node), variable.itemName).visit(expression)
+
+    def GetNumpyArray(self, item_type, length):
+        """
+            Builds the zero initialized NumPy array of the given item type.
+        """
+
+        self.UsesNumpy = True
+        numpy = ast.Name(id="__numpy__", ctx=ast.Load())
+        dtype = ast.Attribute(value=numpy, attr=numpy_types[item_type], ctx=ast.Load())
+
+        return ast.Call(func=ast.Attribute(value=numpy, attr="zeros", ctx=ast.Load()),
+                        args=[length], keywords=[ast.keyword(arg="dtype", value=dtype)])
+
+    def ParseDoWhileStatement(self, doWhile_node):
         """
             Parses the do-while cycle statement to Python.
         """
 
-        current_level = level * '\t'
         condition_node = doWhile_node.GetChildren()[1].GetChildren()[0]
-
         code_node = doWhile_node.GetChildren()[0]
-        instructions_out = [self.ParseInstruction(instruction, level) for instruction in code_node.GetChildren()]
-        instructions_in = [self.ParseInstruction(instruction, level + 1) for instruction in code_node.GetChildren()]
 
-        code_block_out = '\n'.join(instructions_out)
-        code_block_in = '\n'.join(instructions_in)
+        def GetExitCheck():
+            condition = ast.UnaryOp(op=ast.Not(), operand=self.ParseExpression(condition_node))
+            return self.Locate(ast.If(test=condition, body=[ast.Break()], orelse=[]), condition_node)
+
+        # Body is emitted once, the condition is checked at its end and before every continue
+        body = self.LowerContinue(self.ParseBlock(code_node), lambda: [GetExitCheck(), ast.Continue()])
+        body.append(GetExitCheck())
+
+        return [ast.While(test=ast.Constant(value=True), body=body, orelse=[])]
+
+    def LowerContinue(self, body, get_statements):
+        """
+            Replaces continue of the cycle in its body by the statements built by the given function, continue of the
+            nested cycles is kept.
+        """
+
+        lowering = ContinueLowering(get_statements)
+        statements = []
+
+        for statement in body:
+            lowered = lowering.visit(statement)
+            if isinstance(lowered, list):
+                statements.extend(lowered)
+            else:
+                statements.append(lowered)
 
-        return f"{code_block_out}" \
-               f"\n{current_level}while {self.ParseOperator(condition_node, 0)}:\n{code_block_in}"
+        return statements
 
-    def ParseUnaryOperatorStatement(self, unary_node, level):
+    def ParseUnaryOperatorStatement(self, unary_node):
         """
             Parses unary operator statements to Python.
         """
 
-        current_level = level * '\t'
-        var_name = str(self.GetVariable(unary_node.GetChildren()[0].GetLexeme().itemValue).itemName)
+        target = self.ParseVariable(unary_node.GetChildren()[0], ast.Store())
 
         if unary_node.GetLexeme().itemValue == Language.Operators.INCREMENT:
-            return f"{current_level}{var_name}+=1"
+            return [ast.AugAssign(target=target, op=ast.Add(), value=ast.Constant(value=1))]
         elif unary_node.GetLexeme().itemValue == Language.Operators.DECREMENT:
-            return f"{current_level}{var_name}-=1"
+            return [ast.AugAssign(target=target, op=ast.Sub(), value=ast.Constant(value=1))]
 
-    def ParseCinStatement(self, cin_node, level):
+    def ParseCinStatement(self, cin_node):
         """
             Parses the input statement to Python.
         """
 
-        current_level = level * '\t'
-        children = cin_node.GetChildren()
         instructions = []
 
-        for node in children:
+        for node in cin_node.GetChildren():
             lexeme = node.GetLexeme()
-            instruction = None
 
-            if not node.GetChildren():
-                if lexeme.itemType == Language.LexemeTypes.IDENTIFIER:
-                    arg_type = str(self.GetArgType(self.GetVariable(lexeme.itemValue).itemType))
-                    instruction = f"{current_level}" \
-                                  f"{str(self.GetVariable(lexeme.itemValue).itemName)}={arg_type}(input())"
-            elif lexeme.itemType == Language.LexemeTypes.IDENTIFIER:
-                var_name = str(self.GetVariable(lexeme.itemValue).itemName)
-                var_len = self.ParseOperator(node.GetChildren()[0], 0)
-                item_type = str(self.GetArgType(self.GetVariable(lexeme.itemValue).itemType[1]))
-                instruction = f"{current_level}" \
-                              f"{var_name}[{var_len}]={item_type}(input())"
-            if instruction is not None:
-                instructions.append(instruction)
-            else:
+            if lexeme.itemType != Language.LexemeTypes.IDENTIFIER:
                 raise ValueError("Bad arg to input")
 
-        return '\n'.join(instructions)
+            value = self.GetInputValue(GetItemType(self.GetVariable(lexeme.itemValue).itemType))
+            instructions.append(ast.Assign(targets=[self.ParseVariable(node, ast.Store())], value=value))
 
+        return instructions
 
+    def GetInputValue(self, item_type):
+        """
+            Builds the expression taking the next input token and converting it to the given type.
+        """
 
-    def ParseCoutStatement(self, cout_node, level):
+        token = ast.Call(func=ast.Name(id="__cin__", ctx=ast.Load()), args=[], keywords=[])
+
+        if item_type == Language.VariableTypes.STRING:
+            return ast.Call(func=ast.Attribute(value=token, attr="decode", ctx=ast.Load()), args=[], keywords=[])
+
+        if item_type == Language.VariableTypes.BOOL:
+            # CPP reads bool as a number
+            number = ast.Call(func=ast.Name(id="int", ctx=ast.Load()), args=[token], keywords=[])
+            return ast.Compare(left=number, ops=[ast.NotEq()], comparators=[ast.Constant(value=0)])
+
+        return ast.Call(func=ast.Name(id=self.GetArgType(item_type), ctx=ast.Load()), args=[token], keywords=[])
+
+    def ParseCoutStatement(self, cout_node):
         """
             Parses the output statement to Python.
         """
 
-        current_level = level * '\t'
-        children = cout_node.GetChildren()
-        messages = []
+        # Operands of the chained << are joined into one string written at once
+        parts = []
+        new_line = False
 
-        for node in children:
+        for node in cout_node.GetChildren():
             lexeme = node.GetLexeme()
-            message = None
 
-            if not node.GetChildren():
-                if lexeme.itemType == Language.LexemeTypes.IDENTIFIER:
-                    message = str(self.GetVariable(lexeme.itemValue).itemName)
-                elif lexeme.itemType in [Language.LexemeTypes.INT_NUM, Language.LexemeTypes.DOUBLE_NUM]:
-                    message = str(self.GetLiteral(lexeme.itemValue).itemValue)
-                elif lexeme.itemType == Language.LexemeTypes.STRING:
-                    message = repr(self.GetLiteral(lexeme.itemValue).itemValue)
-                elif lexeme.itemValue == Language.KeyWords.ENDL:
-                    message = repr("\n")
-            elif lexeme.itemType == Language.LexemeTypes.IDENTIFIER:
-                var_name = str(self.GetVariable(lexeme.itemValue).itemName)
-                var_len = self.ParseOperator(node.GetChildren()[0], 0)
-                message = f"{var_name}[{var_len}]"
-            if message is not None:
-                messages.append(message)
+            if lexeme is not None and lexeme.itemValue == Language.KeyWords.ENDL:
+                parts.append(ast.Constant(value="\n"))
+                new_line = True
             else:
-                raise ValueError("Bad arg to print")
+                value = self.ParseExpression(node)
+                if not (isinstance(value, ast.Constant) and isinstance(value.value, str)):
+                    value = ast.FormattedValue(value=value, conversion=-1, format_spec=None)
+                parts.append(value)
 
-        return f"{current_level}print({','.join(messages)}, end={repr('')})"
+        text = self.JoinCoutParts(parts)
+        write = "__endl__" if new_line else "__cout__"
 
-    def ParseReturnExitStatement(self, return_exit_node, level):
+        return [ast.Expr(value=ast.Call(func=ast.Name(id=write, ctx=ast.Load()), args=[text], keywords=[]))]
+
+    def JoinCoutParts(self, parts):
         """
-            Parses the return and exit statements to Python.
+            Builds the string expression of the output parts: adjacent string constants are merged, the text without
+            formatted values stays a constant.
         """
 
-        current_level = level * '\t'
-        children = return_exit_node.GetChildren()
-        return_arg = None
+        values = []
 
-        if children:
-            node = children[0]
-            lexeme = node.GetLexeme()
+        for part in parts:
+            if isinstance(part, ast.Constant) and values and isinstance(values[-1], ast.Constant):
+                values[-1] = ast.Constant(value=values[-1].value + part.value)
+            else:
+                values.append(part)
 
-            if not node.GetChildren():
-                if lexeme.itemType == Language.LexemeTypes.IDENTIFIER:
-                    return_arg = str(self.GetVariable(lexeme.itemValue).itemName)
-                elif lexeme.itemType in [Language.LexemeTypes.INT_NUM, Language.LexemeTypes.DOUBLE_NUM]:
-                    return_arg = str(self.GetLiteral(lexeme.itemValue).itemValue)
-                elif lexeme.itemType == Language.LexemeTypes.STRING:
-                    return_arg = repr(self.GetLiteral(lexeme.itemValue).itemValue)
-            elif lexeme.itemType == Language.LexemeTypes.IDENTIFIER:
-                var_name = str(self.GetVariable(lexeme.itemValue).itemName)
-                var_len = self.ParseOperator(node.GetChildren()[0], 0)
-                return_arg = f"{var_name}[{var_len}]"
+        if len(values) == 1 and isinstance(values[0], ast.Constant):
+            return values[0]
 
-            if return_arg is None:
-                raise ValueError("Bad return argument")
-            else:
-                if return_exit_node.GetLexeme().itemValue == Language.KeyWords.RETURN:
-                    return f"{current_level}return {return_arg}"
-                elif return_exit_node.GetLexeme().itemValue == Language.KeyWords.EXIT:
-                    return f"{current_level}quit({return_arg})"
-        else:
-            if return_exit_node.GetLexeme().itemValue == Language.KeyWords.RETURN:
-                return f"{current_level}return"
-            elif return_exit_node.GetLexeme().itemValue == Language.KeyWords.EXIT:
-                return f"{current_level}quit()"
+        return ast.JoinedStr(values=values)
+
+    def ParseReturnExitStatement(self, return_exit_node):
+        """
+            Parses the return and exit statements to Python.
+        """
+
+        children = return_exit_node.GetChildren()
+        return_arg = self.ParseExpression(children[0]) if children else None
+
+        if return_exit_node.GetLexeme().itemValue == Language.KeyWords.RETURN:
+            return [ast.Return(value=return_arg)]
+        elif return_exit_node.GetLexeme().itemValue == Language.KeyWords.EXIT:
+            arguments = [return_arg] if return_arg is not None else []
+            return [ast.Expr(value=ast.Call(func=ast.Name(id="quit", ctx=ast.Load()), args=arguments, keywords=[]))]
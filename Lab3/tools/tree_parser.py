@@ -1,7 +1,9 @@
+import bisect
 import contextlib
 from core.errors import *
 from core.tree import *
 from core.checks import *
+from core.variable_types import *
 
 
 class TreeParser:
@@ -22,6 +24,11 @@ class TreeParser:
         self.LiteralTable = literal_table
         self.VariableTable = variable_table
 
+        # Positions of the variables in the table by name and block id, in ascending order
+        self.VariableIds = {}
+        for position, variable in enumerate(self.VariableTable):
+            self.VariableIds.setdefault((variable.itemName, variable.itemBlockId), []).append(position)
+
         # Parser variables
         self.CurrLexemeIndex = 0
         self.BlockLevel = 0
@@ -221,8 +228,8 @@ class TreeParser:
 
         # Function name
         identifier_node = self.ParseDeclareIdentifier(var_type)
-        self.GetVariable(identifier_node.GetLexeme()).itemBlockLevel -= 1
-        self.GetVariable(identifier_node.GetLexeme()).itemBlockId = 0
+        function = self.GetVariable(identifier_node.GetLexeme())
+        self.SetVariableScope(identifier_node.GetLexeme().itemValue, function.itemBlockLevel - 1, 0)
 
         # Function declaration statement
         declaration_node = SyntaxTreeNode(None, SyntaxTreNodeTypes.FUNCTION_DECLARATION)
@@ -244,7 +251,7 @@ class TreeParser:
         declaration_node.AddChild(arguments_node)
 
         # Function body
-        declaration_node.AddChild(self.ParseBlockCode(var_type[1]))
+        declaration_node.AddChild(self.ParseBlockCode(var_type.Item))
 
         # Exiting function scope
         self.ExitBlock()
@@ -334,10 +341,10 @@ class TreeParser:
                     self.GetNeighbourLexeme(1).itemValue
                     == Language.Delimiters.LEFT_BRACKET
                 ):
-                    var_type = [Language.VariableTypes.ARRAY, var_type]
+                    var_type = ArrayOf(var_type)
 
-                elif isinstance(var_type, list):
-                    var_type = var_type[1]
+                elif type(var_type) is CompoundType:
+                    var_type = var_type.Item
                 # Variable name
                 identifier_node = self.ParseDeclareIdentifier(var_type)
 
@@ -397,15 +404,15 @@ class TreeParser:
         # Add subType:
         if self.GetNeighbourLexeme(1).itemType == Language.LexemeTypes.IDENTIFIER \
                 and self.GetNeighbourLexeme(2).itemValue == Language.Delimiters.OPEN_PARENTHESIS:
-            var_type = [Language.VariableTypes.FUNCTION, var_type]
+            var_type = FunctionReturning(var_type)
         elif self.GetNeighbourLexeme(1).itemValue == Language.Operators.MULTIPLY:
             self.NextLexeme()
-            var_type = [Language.VariableTypes.POINTER, var_type]
+            var_type = PointerTo(var_type)
         elif self.GetNeighbourLexeme(1).itemValue == Language.Operators.BITWISE_AND:
             self.NextLexeme()
-            var_type = [Language.VariableTypes.REFERENCE, var_type]
+            var_type = ReferenceTo(var_type)
         elif self.GetNeighbourLexeme(2).itemValue == Language.Delimiters.LEFT_BRACKET:
-            var_type = [Language.VariableTypes.ARRAY, var_type]
+            var_type = ArrayOf(var_type)
 
         # Switch to variable name
         self.NextLexeme()
@@ -430,20 +437,19 @@ class TreeParser:
 
         if curr_var.itemType not in [Language.VariableTypes.UNKNOWN]:
             # Check for the double declaration of the variable
-            for var in self.VariableTable:
-                if curr_var.itemName == var.itemName and block_id == var.itemBlockId:
-                    raise DoubleDeclarationError(curr_var.itemName,
-                                                 self.Source, lexeme.coordinate_line, lexeme.coordinate_offset)
+            if self.VariableIds.get((curr_var.itemName, block_id)):
+                raise DoubleDeclarationError(curr_var.itemName,
+                                             self.Source, lexeme.coordinate_line, lexeme.coordinate_offset)
 
             self.VariableTable.append(VariableTableItem(len(self.VariableTable), block_id,
                                                         block_level, curr_var.itemName, var_type))
             curr_var = self.VariableTable[-1]
             lexeme.itemValue = len(self.VariableTable) - 1
+            self.VariableIds.setdefault((curr_var.itemName, block_id), []).append(lexeme.itemValue)
 
         # Setup correct variable data
         curr_var.itemType = var_type
-        curr_var.itemBlockLevel = block_level
-        curr_var.itemBlockId = block_id
+        self.SetVariableScope(lexeme.itemValue, block_level, block_id)
 
         self.NextLexeme()
 
@@ -483,6 +489,25 @@ class TreeParser:
 
         return code_block_node
 
+    def IsFunctionCall(self, lexeme):
+        """
+            Checks the current identifier lexeme to start a function call. Identifiers are not resolved yet, so the
+            function declared in another block is searched by name among the top level variables.
+        """
+
+        if lexeme.itemType != Language.LexemeTypes.IDENTIFIER:
+            return False
+
+        var = self.GetVariable(lexeme)
+        if GetTypeKind(var.itemType) == Language.VariableTypes.FUNCTION:
+            return True
+        if var.itemType != Language.VariableTypes.UNKNOWN \
+                or self.GetNeighbourLexeme(1).itemValue != Language.Delimiters.OPEN_PARENTHESIS:
+            return False
+
+        return any(GetTypeKind(self.VariableTable[position].itemType) == Language.VariableTypes.FUNCTION
+                   for position in self.VariableIds.get((var.itemName, 0), []))
+
     def ParseUsingIdentifier(self):
         """
             Checks identifier to be used.
@@ -503,24 +528,15 @@ class TreeParser:
             block_level = scope[0]
             block_id = scope[1]
 
-            # Search for variable in selected scope by name
-            searched_var = None
-            if filtered_vars := [
-                v
-                for v in self.VariableTable
-                if v.itemName == var.itemName and v.itemBlockId == block_id and v.itemBlockLevel == block_level
-                   and v.itemType != Language.VariableTypes.UNKNOWN
-            ]:
-                searched_var = max(filtered_vars, key=lambda x: x.itemId)
-
-            # Prevent using undefined variables
-            if searched_var is None or \
-                    searched_var.itemType == Language.VariableTypes.UNKNOWN:
-                continue
-
-            # Try to get variable id
-            with contextlib.suppress(ValueError):
-                var_real_id = self.VariableTable.index(searched_var)
+            # Search for the last declared variable in selected scope by name, undefined variables are skipped
+            for position in reversed(self.VariableIds.get((var.itemName, block_id), [])):
+                searched_var = self.VariableTable[position]
+                if searched_var.itemBlockLevel == block_level \
+                        and searched_var.itemType != Language.VariableTypes.UNKNOWN:
+                    var_real_id = position
+                    break
+
+            if var_real_id >= 0:
                 break
 
         if var_real_id < 0:
@@ -563,13 +579,12 @@ class TreeParser:
                                   identifier_lexeme.coordinate_line, identifier_lexeme.coordinate_offset)
             if var_type in [Language.VariableTypes.INT, Language.VariableTypes.DOUBLE]:
                 right_node = self.ParseArithmeticExpr()
-            if isinstance(var.itemType, list) \
-                    and var_type[0] in [Language.VariableTypes.POINTER, Language.VariableTypes.ARRAY]:
-                if var_type[1] in [Language.VariableTypes.INT, Language.VariableTypes.DOUBLE]:
+            if GetTypeKind(var_type) in [Language.VariableTypes.POINTER, Language.VariableTypes.ARRAY]:
+                if var_type.Item in [Language.VariableTypes.INT, Language.VariableTypes.DOUBLE]:
                     right_node = self.ParseArithmeticExpr()
-                elif var_type[1] == Language.VariableTypes.STRING:
+                elif var_type.Item == Language.VariableTypes.STRING:
                     right_node = self.ParseStringExpr()
-                elif var_type[1] == Language.VariableTypes.BOOL:
+                elif var_type.Item == Language.VariableTypes.BOOL:
                     right_node = self.ParseBoolExpr()
             elif var_type == Language.VariableTypes.STRING:
                 right_node = self.ParseStringExpr()
@@ -642,9 +657,7 @@ class TreeParser:
         """
 
         lexeme = self.GetCurrentLexeme()
-        function_call = lexeme.itemType == Language.LexemeTypes.IDENTIFIER and \
-                isinstance(self.GetVariable(lexeme).itemType, list) and \
-                self.GetVariable(lexeme).itemType[0] == Language.VariableTypes.FUNCTION
+        function_call = self.IsFunctionCall(lexeme)
 
         if self.CurrentLexemeMatches(Language.Delimiters.OPEN_PARENTHESIS):
             self.NextLexeme()
@@ -696,9 +709,7 @@ class TreeParser:
         """
 
         lexeme = self.GetCurrentLexeme()
-        if lexeme.itemType == Language.LexemeTypes.IDENTIFIER and \
-                isinstance(self.GetVariable(lexeme).itemType, list) and \
-                self.GetVariable(lexeme).itemType[0] == Language.VariableTypes.FUNCTION:
+        if self.IsFunctionCall(lexeme):
             node = self.ParseStatement(True)
             self.NextLexeme()
         elif lexeme.itemType == Language.LexemeTypes.IDENTIFIER:
@@ -848,9 +859,7 @@ class TreeParser:
         """
 
         lexeme = self.GetCurrentLexeme()
-        if lexeme.itemType == Language.LexemeTypes.IDENTIFIER and \
-                isinstance(self.GetVariable(lexeme).itemType, list) and \
-                self.GetVariable(lexeme).itemType[0] == Language.VariableTypes.FUNCTION:
+        if self.IsFunctionCall(lexeme):
             node = self.ParseStatement(True)
             self.NextLexeme()
         elif lexeme.itemType == Language.LexemeTypes.IDENTIFIER and \
@@ -1001,33 +1010,42 @@ class TreeParser:
             lexeme = self.GetCurrentLexeme()
             raise ExpectedError("bool expression", self.Source, lexeme.coordinate_line, lexeme.coordinate_offset)
 
-        # for condition
+        # for condition: init, break condition, variable change and body are always the four children,
+        # missing parts are kept as None
+        init_node = None
+        condition_node = None
+        step_node = None
+        statement_node = None
+
         # Possible var used
         if not self.CurrentLexemeMatches(Language.Delimiters.SEMICOLON):
-            for_node.AddChild(self.ParseStatement())
+            init_node = self.ParseStatement()
+        else:
+            self.NextLexeme()
 
         # Possible break condition
         if not self.CurrentLexemeMatches(Language.Delimiters.SEMICOLON):
-            for_node.AddChild(self.ParseBoolExpr())
+            condition_node = self.ParseBoolExpr()
 
         # Possible variable change
+        self.WaitForDelimiter(Language.Delimiters.SEMICOLON)
         self.NextLexeme()
         if not self.CurrentLexemeMatches(Language.Delimiters.CLOSE_PARENTHESIS):
-            for_node.AddChild(self.ParseStatement(True))
+            step_node = self.ParseStatement(True)
 
         # )
         self.WaitForDelimiter(Language.Delimiters.CLOSE_PARENTHESIS)
         self.NextLexeme()
 
-        # Check for the empty cycle body
-        if self.CurrentLexemeMatches(Language.Delimiters.SEMICOLON):
-            return for_node
-
-        # Parse body of the cycle
-        self.NestingLoop += 1
-        statement_node = self.ParseStatement()
-        self.NestingLoop -= 1
+        # Parse body of the cycle if it is not empty
+        if not self.CurrentLexemeMatches(Language.Delimiters.SEMICOLON):
+            self.NestingLoop += 1
+            statement_node = self.ParseStatement()
+            self.NestingLoop -= 1
 
+        for_node.AddChild(init_node)
+        for_node.AddChild(condition_node)
+        for_node.AddChild(step_node)
         for_node.AddChild(statement_node)
 
         return for_node
@@ -1293,10 +1311,7 @@ class TreeParser:
                     lexeme.coordinate_offset,
                 )
         elif var.itemType not in type:
-            if (
-                isinstance(var.itemType, list)
-                and var.itemType[1] in type
-            ):
+            if GetItemType(var.itemType) in type:
                 return
             raise ExpectedError(
                 f"one of the following variable types: {str(type)}",
@@ -1363,6 +1378,18 @@ class TreeParser:
 
         return self.VariableTable[lexeme.itemValue]
 
+    def SetVariableScope(self, position, block_level, block_id):
+        """
+            Moves the variable at the given position of the table to the scope, the index by name and block id follows.
+        """
+
+        variable = self.VariableTable[position]
+
+        self.VariableIds[(variable.itemName, variable.itemBlockId)].remove(position)
+        variable.itemBlockLevel = block_level
+        variable.itemBlockId = block_id
+        bisect.insort(self.VariableIds.setdefault((variable.itemName, block_id), []), position)
+
     def EnterBlock(self):
         """
             Change scope values for the entering code block.